@@ -0,0 +1,83 @@
+# Achievement page parsing: full html.parser tree (the old path) vs the strained parse with each backend
+# Pages are synthetic, shaped like SteamDB's stats page and Steam Community's achievements page
+import json
+import argparse
+from bs4 import BeautifulSoup
+from common import Timer
+from src.core import achievements
+
+# Navigation, rows and inline scripts the parser has to get through before the achievements
+def filler(rows):
+    return "".join(f'<div class="row"><span>noise {i}</span><a href="/x/{i}">link &amp; {i}</a><script>var a={i};</script></div>'
+                   for i in range(rows))
+
+def steamdb_page(count, rows):
+    items = []
+    for i in range(count):
+        icon = f"{i:040d}"
+        desc = (f'<span class="achievement_spoiler">Secret &quot;{i}&quot; ™</span>' if i % 5 == 0
+                else f'Do thing {i} &amp; more <b>bold</b>')
+        items.append(f'<div class="achievement" id="a{i}"><div class="achievement_inner">'
+                     f'<img class="icon" data-name="{icon}.jpg" src="x"><img data-name="{icon}_g.jpg">\n'
+                     f'<div class="achievement_name">Ach Name {i} é</div><div class="achievement_desc">{desc}</div></div>'
+                     f'<div class="achievement_right"><div class="achievement_api">ACH_{i}</div></div></div>')
+    return f'<html><head><title>Stats</title></head><body>{filler(rows)}<div id="achievements">{"".join(items)}</div></body></html>'
+
+def community_page(count, rows):
+    items = []
+    for i in range(count):
+        desc = "" if i % 5 == 0 else f"Desc {i} &lt;b&gt;"
+        items.append(f'<div class="achieveRow "><div class="achieveImgHolder"><img src="https://cdn/x/{i:040d}.jpg" width="64"></div>'
+                     f'<div class="achieveTxtHolder"><div class="achieveTxt"><h3>Row {i} ü</h3><h5>{desc}</h5></div></div></div>')
+    return f'<html><head><title>Achievements</title></head><body>{filler(rows)}<div id="mainContents">{"".join(items)}</div></body></html>'
+
+def full_tree(markup, strainer, parser=None):
+    return BeautifulSoup(markup, 'html.parser')
+
+def parse_both(steamdb, community, parser=None):
+    return achievements.parse_steamdb_achievements(steamdb, parser), achievements.parse_steamcommunity_achievements(community, parser)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--achievements", type=int, default=600, help="achievements per page")
+    parser.add_argument("--filler", type=int, default=20_000, help="non-achievement rows per page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend, the best one is reported")
+    args = parser.parse_args()
+    
+    steamdb = steamdb_page(args.achievements, args.filler)
+    community = community_page(args.achievements, args.filler).encode('utf-8')
+    print(f"SteamDB page {len(steamdb.encode('utf-8')) / 2**20:.1f} MiB, Steam Community page {len(community) / 2**20:.1f} MiB, "
+          f"{args.achievements} achievements each")
+    
+    def best(parse):
+        times = []
+        for _ in range(args.repeat):
+            with Timer() as timer:
+                result = parse()
+            times.append(timer.elapsed)
+        return min(times), result
+    
+    # The old path: a whole-page tree with the same selectors
+    strained = achievements.parse_html
+    achievements.parse_html = full_tree
+    try:
+        baseline_time, baseline = best(lambda: parse_both(steamdb, community))
+    finally:
+        achievements.parse_html = strained
+    print(f"{'full tree, html.parser':>24}: {baseline_time:.2f}s")
+    
+    backends = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        backends.append("lxml")
+    except ImportError:
+        print("lxml not installed, skipping it")
+    
+    for backend in backends:
+        elapsed, result = best(lambda: parse_both(steamdb, community, backend))
+        identical = json.dumps(result, ensure_ascii=False) == json.dumps(baseline, ensure_ascii=False)
+        print(f"{'strained, ' + backend:>24}: {elapsed:.2f}s ({baseline_time / elapsed:.1f}x), "
+              f"output {'identical' if identical else 'DIFFERS'}")
+
+if __name__ == "__main__":
+    main()
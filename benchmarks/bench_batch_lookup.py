@@ -0,0 +1,54 @@
+# get_steam_app_by_id in a loop vs one get_steam_apps_by_ids call
+# Local hits come from a synthetic steam_data.db, misses from a stand-in store with a fixed latency
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from common import Timer, build_synthetic_db, open_index
+from src.core import appID_finder
+
+def fake_store(latency):
+    def fetch_store_app(appid, session=None):
+        time.sleep(latency)
+        return f"Store app {appid}", True
+    return fetch_store_app
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=200_000, help="apps in the synthetic list")
+    parser.add_argument("--ids", type=int, default=1000, help="AppIDs to resolve")
+    parser.add_argument("--misses", type=float, default=0.1, help="share of AppIDs only the store knows")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per store request")
+    args = parser.parse_args()
+    
+    appID_finder.fetch_store_app = fake_store(args.latency)
+    misses = int(args.ids * args.misses)
+    appids = [i * 10 for i in range(0, (args.ids - misses) * 7, 7)] + [args.apps * 10 + i for i in range(misses)]
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(workdir, "template")
+        with Timer() as build:
+            build_synthetic_db(template, args.apps)
+        print(f"Built synthetic index of {args.apps} apps in {build.elapsed:.1f}s")
+        
+        for mode in ("loop", "batch"):
+            # Fresh copy per mode, the store answers are written back to the database
+            run_dir = os.path.join(workdir, mode)
+            shutil.copytree(template, run_dir)
+            open_index(run_dir)
+            
+            with Timer() as timer:
+                if mode == "loop":
+                    results = {appid: appID_finder.get_steam_app_by_id(appid) for appid in appids}
+                else:
+                    results = appID_finder.get_steam_apps_by_ids(appids)
+            found = sum(result is not None for result in results.values())
+            print(f"{mode:>5}: {timer.elapsed:.2f}s for {len(appids)} IDs ({misses} from the store), {found} resolved")
+    finally:
+        appID_finder._app_index = None
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
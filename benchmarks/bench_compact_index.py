@@ -0,0 +1,63 @@
+# Cold-start and warm lookup latency plus memory: SQLite vs the memory-mapped steam_apps.idx
+# Each path runs in its own process so start-up cost and peak RSS aren't shared
+import os
+import sys
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from common import Timer, build_synthetic_db, rss_mib
+from src.core import appID_finder
+from src.core.compact_index import COMPACT_INDEX_NAME, build_compact_index
+
+def run_lookups(output_dir, mode, apps, lookups):
+    rss_before = rss_mib()
+    index = appID_finder.AppIndex(output_dir).configure(max_age=None, compact_index=(mode == "compact"))
+    appID_finder._app_index = index
+    
+    # Only IDs that exist, a miss would go to the store
+    rng = random.Random(1)
+    appids = [rng.randrange(apps) * 10 for _ in range(lookups)]
+    
+    with Timer() as first:
+        result = appID_finder.get_steam_app_by_id(appids[0])
+    assert result is not None
+    
+    with Timer() as warm:
+        for appid in appids:
+            index.hits.clear()    # Measure the index, not the LRU in front of it
+            appID_finder.get_steam_app_by_id(appid)
+    
+    # Touched pages of the mapped steam_apps.idx count toward RSS, they are clean and backed by the page cache
+    print(f"{mode:>7}: first lookup {first.elapsed * 1e3:.2f} ms, warm {warm.elapsed / lookups * 1e6:.1f} us/lookup, "
+          f"RSS {rss_mib():.1f} MiB (+{rss_mib() - rss_before:.1f} MiB for the lookups)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=500_000, help="apps in the synthetic list")
+    parser.add_argument("--lookups", type=int, default=10_000, help="warm lookups per path")
+    parser.add_argument("--child", nargs=2, metavar=("DIR", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_lookups(args.child[0], args.child[1], args.apps, args.lookups)
+        return
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        with Timer() as build:
+            db_file = build_synthetic_db(workdir, args.apps)
+            count = build_compact_index(db_file, os.path.join(workdir, COMPACT_INDEX_NAME))
+        print(f"Built synthetic index of {count} apps in {build.elapsed:.1f}s "
+              f"(steam_data.db {os.path.getsize(db_file) / 2**20:.1f} MiB, "
+              f"{COMPACT_INDEX_NAME} {os.path.getsize(os.path.join(workdir, COMPACT_INDEX_NAME)) / 2**20:.1f} MiB)")
+        
+        for mode in ("sqlite", "compact"):
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--apps", str(args.apps), "--lookups", str(args.lookups),
+                            "--child", workdir, mode], check=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
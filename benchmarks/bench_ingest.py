@@ -0,0 +1,79 @@
+# App list ingest: the old response.json() + one execute per row vs iter_app_list + ingest_app_list
+# The list is served from a local stand-in for GetAppList and each path runs in its own process for a clean peak RSS
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from common import Timer, peak_rss_mib, synthetic_apps
+from curl_cffi import requests
+from src.core import appID_finder
+
+APP_LIST_FILE = "GetAppList.json"
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def ingest_json(conn, url):
+    # Whole response in memory, decoded at once, then inserted row by row
+    response = requests.get(url, timeout=30)
+    app_list = response.json()['applist']['apps']
+    
+    cursor = conn.cursor()
+    cursor.execute('BEGIN TRANSACTION')
+    for app in app_list:
+        cursor.execute('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', (app['appid'], app['name']))
+    conn.commit()
+    return len(app_list)
+
+def ingest_stream(conn, url):
+    appID_finder.APP_LIST_URL = url
+    return appID_finder.ingest_app_list(conn, appID_finder.stream_app_list())
+
+def run_ingest(url, mode, workdir):
+    db_file = os.path.join(workdir, f"{mode}.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute('''CREATE TABLE IF NOT EXISTS apps (appid INTEGER PRIMARY KEY, name TEXT)''')
+    
+    with Timer() as timer:
+        rows = (ingest_json if mode == "json" else ingest_stream)(conn, url)
+    assert conn.execute('SELECT COUNT(*) FROM apps').fetchone()[0] == rows
+    conn.close()
+    
+    print(f"{mode:>6}: {rows} rows in {timer.elapsed:.2f}s, {rows / timer.elapsed:,.0f} rows/s, peak RSS {peak_rss_mib():.1f} MiB")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=250_000, help="apps in the synthetic list")
+    parser.add_argument("--child", nargs=3, metavar=("URL", "MODE", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_ingest(*args.child)
+        return
+    
+    workdir = tempfile.mkdtemp()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=workdir))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        path = os.path.join(workdir, APP_LIST_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'applist': {'apps': list(synthetic_apps(args.apps))}}, f)
+        print(f"Serving {args.apps} apps ({os.path.getsize(path) / 2**20:.1f} MiB of JSON)")
+        
+        url = f"http://127.0.0.1:{httpd.server_address[1]}/{APP_LIST_FILE}"
+        for mode in ("json", "stream"):
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--child", url, mode, workdir], check=True)
+    finally:
+        httpd.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
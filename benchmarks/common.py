@@ -0,0 +1,74 @@
+# Shared helpers for the benchmark scripts, run them from the repo root:
+#   python benchmarks/<script>.py --help
+import os
+import sys
+import time
+import random
+import ctypes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import appID_finder
+
+WORDS = ["Dark", "Space", "Legend", "Quest", "Simulator", "Tactics", "Racing", "Soundtrack", "Chronicles",
+         "Arena", "Island", "Kingdom", "Zombie", "Puzzle", "Empire", "Station", "Pack", "Edition"]
+
+# Synthetic app list: every tenth AppID exists, like the sparse IDs of the real list
+def synthetic_apps(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {'appid': i * 10, 'name': " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))}
+
+# Make the steam_data.db in output_dir the process-wide index
+def open_index(output_dir, **configure):
+    index = appID_finder.AppIndex(output_dir).configure(max_age=None, **configure)
+    appID_finder._app_index = index
+    return index.ensure_ready()
+
+# Build steam_data.db in output_dir from the synthetic list and close it again
+def build_synthetic_db(output_dir, count):
+    apps = list(synthetic_apps(count))
+    appID_finder.stream_app_list = lambda: iter(apps)
+    index = open_index(output_dir)
+    index.conn.close()
+    appID_finder._app_index = None
+    return index.db_file
+
+def _process_memory_counters():
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + \
+                   [(name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                                                          "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                                                          "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+    return counters
+
+# Resident set size of this process in MiB
+def rss_mib():
+    if sys.platform == "win32":
+        return _process_memory_counters().WorkingSetSize / 2**20
+    
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:    # macOS, only the peak is available
+        return peak_rss_mib()
+
+# Highest resident set size this process has reached, in MiB
+def peak_rss_mib():
+    if sys.platform == "win32":
+        return _process_memory_counters().PeakWorkingSetSize / 2**20
+    
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10    # Bytes on macOS, KiB elsewhere
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *args):
+        self.elapsed = time.perf_counter() - self.started
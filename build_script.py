@@ -44,8 +44,11 @@ def main():
         "src.core.achievements",
         "src.core.appID_finder",
         "src.core.cf_bypass",
+        "src.core.cf_clearance",
+        "src.core.compact_index",
         "src.core.dlc_gen",
         "src.core.goldberg_gen",
+        "src.core.rate_limiter",
         "src.core.setupEmu",
         "src.core.threadManager",
         "src.gui.GSE_Generator"
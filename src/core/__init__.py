@@ -1,19 +1,23 @@
 # src/core/__init__.py
+# Submodules are imported on first use, so e.g. goldberg_gen loads without the browser and GUI stack
 
-from .achievements import fetch_from_steamcommunity, fetch_from_steamdb
-from .appID_finder import get_steam_app_by_id, get_steam_app_by_name
-from .cf_bypass import CF_Scraper
-from .dlc_gen import fetch_dlc, create_dlc_config
-from .goldberg_gen import generate_emu
-from .setupEmu import download_goldberg, extract_archive
-from .threadManager import ThreadManager
+import importlib
 
-__all__ = [
-    "fetch_from_steamcommunity", "fetch_from_steamdb",
-    "get_steam_app_by_id", "get_steam_app_by_name",
-    "CF_Scraper",
-    "fetch_dlc", "create_dlc_config",
-    "generate_emu",
-    "download_goldberg", "extract_archive",
-    "ThreadManager"
-]
+_EXPORTS = {
+    "fetch_achievements": "achievements", "fetch_from_steamapi": "achievements",
+    "fetch_from_steamcommunity": "achievements", "fetch_from_steamdb": "achievements",
+    "get_steam_app_by_id": "appID_finder", "get_steam_apps_by_ids": "appID_finder",
+    "get_steam_app_by_name": "appID_finder", "search_apps": "appID_finder",
+    "BrowserPool": "cf_bypass", "CF_Scraper": "cf_bypass",
+    "fetch_dlc": "dlc_gen", "create_dlc_config": "dlc_gen",
+    "generate_emu": "goldberg_gen",
+    "download_goldberg": "setupEmu", "extract_archive": "setupEmu",
+    "ThreadManager": "threadManager",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
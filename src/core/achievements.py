@@ -1,46 +1,185 @@
 import os
+import re
 import json
+import time
+import random
+import shutil
+import asyncio
+import threading
 import concurrent.futures
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from curl_cffi import requests
 from typing import List, Dict, Set, Optional
 from src.core.cf_bypass import CF_Scraper
+from src.core.cf_clearance import CLEARANCE_TIMEOUT, clearance_get
+from src.core.rate_limiter import get_limiter, limited_get
+from src.core.appID_finder import get_app_index
+
+# Prefer lxml's C parser, html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Only the achievement nodes are built into a tree, the rest of the page is skipped
+# (the regex matches one class among several, e.g. class="achieveRow ")
+STEAMDB_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)achievement(?:\s|$)"))
+STEAMCOMMUNITY_STRAINER = SoupStrainer(class_=re.compile(r"(?:^|\s)achieveRow(?:\s|$)"))
+
+def parse_html(markup, strainer: SoupStrainer, parser: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, parser or HTML_PARSER, parse_only=strainer)
+
+SESSION_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.5 Safari/605.1.15",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+}
 
 def create_session(session_type: str = "steam", appid: Optional[str] = None) -> requests.Session:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.5 Safari/605.1.15",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
-        "Accept-Encoding": "gzip, deflate, br",
-    }
-    session = requests.Session(impersonate="safari15_5", headers=headers, timeout=30)
+    session = requests.Session(impersonate="safari15_5", headers=SESSION_HEADERS, timeout=30)
     return session
 
-def mk_request(url: str, session: requests.Session) -> requests.Response:
+# Secrets go in params, the error message only carries the bare URL
+def mk_request(url: str, session: requests.Session, params: Optional[Dict] = None) -> requests.Response:
     try:
-        return session.get(url, timeout=30)
+        return limited_get(session, url, params=params, timeout=30)
     except Exception as e:
         raise RuntimeError(f"Failed to fetch URL {url}: {str(e)}")
 
-def download_one_image(image_url: str, image_path: str, session: requests.Session) -> bool:
+# Steam's CDN names achievement icons by content hash, so one store is shared by every game
+IMAGE_CACHE_DIR = os.path.abspath(os.path.join("assets", "image_cache"))
+IMAGE_CDN_URL = "https://cdn.fastly.steamstatic.com/steamcommunity/public/images/apps/{appid}/{name}"
+STEAM_API_URL = "https://api.steampowered.com"
+
+# Image downloader settings; ASYNC_DOWNLOADS=False falls back to the thread pool path
+# (concurrency is set by the CDN's entry in rate_limiter.HOST_LIMITS)
+ASYNC_DOWNLOADS = True
+IMAGE_RETRIES = 3
+RETRY_BACKOFF = 0.5    # Seconds, doubled per attempt and jittered
+
+# ETag/Last-Modified kept next to each cached image
+def read_validators(cache_path: str) -> Dict:
+    try:
+        with open(f"{cache_path}.meta", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def conditional_headers(cache_path: str, revalidate: bool) -> Dict[str, str]:
+    headers = {}
+    if revalidate and os.path.exists(cache_path):
+        validators = read_validators(cache_path)
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+def write_validators(cache_path: str, response: requests.Response):
+    validators = {}
+    if etag := response.headers.get('ETag'):
+        validators['etag'] = etag
+    if last_modified := response.headers.get('Last-Modified'):
+        validators['last_modified'] = last_modified
+    if validators:
+        write_file_atomic(f"{cache_path}.meta", json.dumps(validators).encode('utf-8'))
+
+def write_file_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Hardlink from the store, copying when the folders are on different drives
+def link_image(cache_path: str, image_path: str):
+    try:
+        os.remove(image_path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(cache_path, image_path)
+    except OSError:
+        shutil.copy2(cache_path, image_path)
+
+# Fetch one image into the store; with revalidate, a cached copy is checked with a conditional GET
+def download_one_image(image_url: str, cache_path: str, session: requests.Session, revalidate: bool = False) -> bool:
     try:
-        response = session.get(image_url, timeout=30)
+        response = limited_get(session, image_url, headers=conditional_headers(cache_path, revalidate), timeout=30)
+        if response.status_code == 304:
+            return True
         if response.status_code == 200:
-            with open(image_path, 'wb') as img_file:
-                img_file.write(response.content)
+            write_file_atomic(cache_path, response.content)
+            write_validators(cache_path, response)
             return True
     except Exception:
         pass
     return False
 
-def download_images(appid: str, achievements: List[Dict], session: requests.Session, silent: bool = False):
-    image_folder = "images"
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+# Stream one image to a temp file and rename it into the store, retrying 429/5xx and network errors
+# Returns None on success, otherwise the last error
+async def download_one_image_async(session: requests.AsyncSession, image_url: str, cache_path: str,
+                                   revalidate: bool = False) -> Optional[str]:
+    limiter = get_limiter(image_url)
+    error = None
+    for attempt in range(IMAGE_RETRIES + 1):
+        status = retry_after = None
+        await limiter.acquire_async()
+        started = time.monotonic()
+        tmp_path = f"{cache_path}.{threading.get_ident()}.{attempt}.tmp"
+        try:
+            async with session.stream("GET", image_url, headers=conditional_headers(cache_path, revalidate), timeout=30) as response:
+                status = response.status_code
+                if status == 304:
+                    return None
+                if status == 200:
+                    with open(tmp_path, 'wb') as img_file:
+                        async for chunk in response.aiter_content():
+                            img_file.write(chunk)
+                    os.replace(tmp_path, cache_path)
+                    write_validators(cache_path, response)
+                    return None
+                
+                error = f"HTTP {status}"
+                if status != 429 and status < 500:
+                    return error
+                retry_after = response.headers.get('Retry-After')
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            limiter.release(status, time.monotonic() - started, retry_after)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        if attempt < IMAGE_RETRIES:
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+    return error
+
+async def download_images_async(tasks: List[tuple], headers: Dict[str, str], revalidate: bool = False) -> Dict[str, str]:
+    async with requests.AsyncSession(impersonate="safari15_5", headers=headers) as session:
+        results = await asyncio.gather(*(
+            download_one_image_async(session, url, cache_path, revalidate) for url, cache_path, _ in tasks
+        ))
+    return {os.path.basename(cache_path): error for (_, cache_path, _), error in zip(tasks, results) if error}
+
+# Returns {image file name: error} for images that couldn't be fetched
+def download_images(appid: str, achievements: List[Dict], session: requests.Session, silent: bool = False,
+                    revalidate: bool = False, use_async: Optional[bool] = None, output_dir: str = ".") -> Dict[str, str]:
+    image_folder = os.path.join(output_dir, "images")
     os.makedirs(image_folder, exist_ok=True)
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
     
     download_tasks = []
-    downloaded_images: Set[str] = set()
+    cached_images = []
+    seen_images: Set[str] = set()
     
-    # Collect images to download
+    # Split images into store hits and ones to download
     for achievement in achievements:
         for key in ['icon', 'icongray']:
             icon_name = achievement.get(key)
@@ -48,42 +187,93 @@ def download_images(appid: str, achievements: List[Dict], session: requests.Sess
                 continue
 
             image_file_name = icon_name.split('/')[-1]
-            if image_file_name in downloaded_images:
+            if not image_file_name or image_file_name in seen_images:
                 continue
+            seen_images.add(image_file_name)
 
-            image_url = f"https://cdn.fastly.steamstatic.com/steamcommunity/public/images/apps/{appid}/{image_file_name}"
+            cache_path = os.path.join(IMAGE_CACHE_DIR, image_file_name)
             image_path = os.path.join(image_folder, image_file_name)
-            
-            download_tasks.append((image_url, image_path))
-            downloaded_images.add(image_file_name)
+            if os.path.exists(cache_path) and not revalidate:
+                cached_images.append((cache_path, image_path))
+            else:
+                image_url = IMAGE_CDN_URL.format(appid=appid, name=image_file_name)
+                download_tasks.append((image_url, cache_path, image_path))
     
     if not silent:
-        print(f"Downloading {len(download_tasks)} images...")
+        print(f"Downloading {len(download_tasks)} images ({len(cached_images)} cached)...")
     
     # Download images concurrently
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(download_one_image, url, path, session) for url, path in download_tasks]
-        concurrent.futures.wait(futures)
+    started = time.perf_counter()
+    if not download_tasks:
+        failures = {}
+    elif ASYNC_DOWNLOADS if use_async is None else use_async:
+        failures = asyncio.run(download_images_async(download_tasks, dict(session.headers), revalidate))
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(download_one_image, url, cache_path, session, revalidate) for url, cache_path, _ in download_tasks]
+            concurrent.futures.wait(futures)
+        failures = {os.path.basename(cache_path): "download failed" for future, (_, cache_path, _) in zip(futures, download_tasks) if not future.result()}
     
-    if not silent:
-        successful = sum(1 for f in futures if f.result())
-        print(f"Downloaded {successful}/{len(download_tasks)} images successfully")
-
-def fetch_from_steamdb(appid: str, silent: bool = False) -> List[Dict]:
-    if not silent:
-        print("Fetching achievements from SteamDB...")
+    for _, cache_path, image_path in download_tasks:
+        if os.path.exists(cache_path):    # A failed revalidation still leaves the cached copy usable
+            cached_images.append((cache_path, image_path))
     
-    # Use the scraper to get HTML
-    with CF_Scraper(hide_window=True) as scraper:
-        html_content = scraper.scrape(
-            f"https://steamdb.info/app/{appid}/stats/", 
-            page_load_wait=2
-        )
+    for cache_path, image_path in cached_images:
+        link_image(cache_path, image_path)
     
-    if not html_content:
-        raise RuntimeError("Failed to fetch HTML from SteamDB")
+    if not silent:
+        print(f"Downloaded {len(download_tasks) - len(failures)}/{len(download_tasks)} images successfully in {time.perf_counter() - started:.1f}s")
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    return failures
+
+# Missing icons show up as broken images in game, so these are printed even when silent
+def report_image_failures(failures: Dict[str, str]):
+    if not failures:
+        return
+    print(f"{len(failures)} achievement images could not be downloaded:")
+    for image_file_name, error in failures.items():
+        print(f"  {image_file_name}: {error}")
+
+# Parsed achievement lists are kept in steam_data.db per AppID and source
+ACHIEVEMENT_CACHE_TTL = 7 * 24 * 60 * 60    # Seconds
+_cache_table_ready = False
+
+def _achievement_cache():
+    global _cache_table_ready
+    conn = get_app_index().conn
+    if not _cache_table_ready:
+        with conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS achievement_cache (
+                appid INTEGER, source TEXT, fetched_at REAL, data TEXT, PRIMARY KEY (appid, source))''')
+        _cache_table_ready = True
+    return conn
+
+def load_cached_achievements(appid: str, source: str, ttl: Optional[float] = ACHIEVEMENT_CACHE_TTL) -> Optional[List[Dict]]:
+    if not ttl or ttl <= 0:
+        return None
+    row = _achievement_cache().execute('''SELECT fetched_at, data FROM achievement_cache WHERE appid = ? AND source = ?''', (int(appid), source)).fetchone()
+    if row is None or time.time() - row[0] > ttl:
+        return None
+    return json.loads(row[1])
+
+def store_cached_achievements(appid: str, source: str, achievements: List[Dict]):
+    conn = _achievement_cache()
+    with conn:
+        conn.execute('''INSERT OR REPLACE INTO achievement_cache (appid, source, fetched_at, data) VALUES (?, ?, ?, ?)''',
+                     (int(appid), source, time.time(), json.dumps(achievements, ensure_ascii=False)))
+
+# Write achievements.json and fill images/ for it inside output_dir
+# The json is swapped in whole, so a reader never sees a half-written file
+# Returns {image file name: error} for images that couldn't be fetched
+def save_achievements(appid: str, achievements: List[Dict], session: requests.Session, silent: bool = False,
+                      output_dir: str = ".") -> Dict[str, str]:
+    os.makedirs(output_dir, exist_ok=True)
+    data = json.dumps(achievements, indent=2, ensure_ascii=False).encode('utf-8')
+    write_file_atomic(os.path.join(output_dir, "achievements.json"), data)
+    return download_images(appid, achievements, session, silent, output_dir=output_dir)
+
+def parse_steamdb_achievements(html_content, parser: Optional[str] = None) -> List[Dict]:
+    soup = parse_html(html_content, STEAMDB_STRAINER, parser)
     achievements = []
     
     achievement_divs = soup.select('div.achievement')
@@ -120,64 +310,256 @@ def fetch_from_steamdb(appid: str, silent: bool = False) -> List[Dict]:
             "name": name
         })
 
-    with open("achievements.json", "w", encoding='utf-8') as json_file:
-        json.dump(achievements, json_file, indent=2, ensure_ascii=False)
+    return achievements
+
+USE_BROWSER_POOL = False    # Keep Chromium warm between SteamDB scrapes, worth it for batch runs
+# Scrape returns as soon as the achievement list is in the page, or once the page finished
+# loading without one (games without achievements don't wait out the timeout)
+STEAMDB_READY = "js:document.querySelector('div.achievement') || document.readyState === 'complete'"
+STEAMDB_TIMEOUT = 20    # Seconds
+
+# cache_ttl: seconds a cached list is served for (0 disables); force: always scrape
+# scraper: pass one in to be able to cancel the scrape from another thread
+def get_steamdb_achievements(appid: str, silent: bool = False, cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False,
+                             scraper: Optional[CF_Scraper] = None) -> List[Dict]:
+    achievements = None if force else load_cached_achievements(appid, "steamdb", cache_ttl)
+    if achievements is not None:
+        if not silent:
+            print("Using cached SteamDB achievements...")
+        return achievements
+    
+    if not silent:
+        print("Fetching achievements from SteamDB...")
     
+    url = f"https://steamdb.info/app/{appid}/stats/"
+    
+    # A clearance left by an earlier browser scrape gets a plain HTTP request through
+    html_content = clearance_get(url)
+    achievements = parse_steamdb_achievements(html_content) if html_content else []
+    
+    if not achievements:
+        # Use the scraper to get HTML
+        with scraper or CF_Scraper(hide_window=True, pool=USE_BROWSER_POOL or None) as scraper:
+            html_content = scraper.scrape(
+                url, 
+                ready=STEAMDB_READY,
+                timeout=STEAMDB_TIMEOUT
+            )
+        
+        if not html_content:
+            raise RuntimeError("Failed to fetch HTML from SteamDB")
+        
+        achievements = parse_steamdb_achievements(html_content)
+    if achievements:    # An empty page is more likely a failed scrape than a game without achievements
+        store_cached_achievements(appid, "steamdb", achievements)
+    return achievements
+
+def fetch_from_steamdb(appid: str, silent: bool = False, cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False,
+                       output_dir: str = ".") -> List[Dict]:
+    achievements = get_steamdb_achievements(appid, silent, cache_ttl, force)
+
     # Download images using a single session
     steam_session = create_session("steam")
     try:
-        download_images(appid, achievements, steam_session, silent)
+        report_image_failures(save_achievements(appid, achievements, steam_session, silent, output_dir))
     finally:
         steam_session.close()
     
     return achievements
 
-def fetch_from_steamcommunity(appid: str, silent: bool = False) -> List[Dict]:
-    session = create_session("steam")
+def parse_steamcommunity_achievements(html_content, parser: Optional[str] = None) -> List[Dict]:
+    soup = parse_html(html_content, STEAMCOMMUNITY_STRAINER, parser)
+
+    achievements = []
+    achievement_rows = soup.select('.achieveRow')
+
+    for idx, achievement in enumerate(achievement_rows):
+        img_tag = achievement.select_one('.achieveImgHolder img')
+        icon = ""
+        if img_tag and img_tag.get('src'):
+            icon_src = str(img_tag['src'])
+            icon = icon_src.split('/')[-1]
+        
+        name_tag = achievement.select_one('.achieveTxt h3')
+        displayName = name_tag.text.strip() if name_tag else ""
+        
+        description_tag = achievement.select_one('.achieveTxt h5')
+        description = description_tag.text.strip() if description_tag else ""
+        hidden = 1 if description == "" else 0
+
+        achievements.append({
+            "description": description,
+            "displayName": displayName,
+            "hidden": hidden,
+            "icon": f"images/{icon}",
+            "icongray": f"images/{icon}",
+            "name": f"ach{idx + 1}"
+        })
+
+    return achievements
+
+def get_steamcommunity_achievements(appid: str, silent: bool = False, cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False,
+                                    session: Optional[requests.Session] = None) -> List[Dict]:
+    achievements = None if force else load_cached_achievements(appid, "steamcommunity", cache_ttl)
+    if achievements is not None:
+        if not silent:
+            print("Using cached Steam Community achievements...")
+        return achievements
+    
+    url = f"https://steamcommunity.com/stats/{appid}/achievements/"
+    if not silent:
+        print("Fetching achievements from Steam Community...")
     
+    own_session = session is None
+    session = session or create_session("steam")
     try:
-        url = f"https://steamcommunity.com/stats/{appid}/achievements/"
-        if not silent:
-            print("Fetching achievements from Steam Community...")
-        
         response = mk_request(url, session)
-        soup = BeautifulSoup(response.content, 'html.parser')
+    finally:
+        if own_session:
+            session.close()
+    
+    achievements = parse_steamcommunity_achievements(response.content)
+    if achievements:
+        store_cached_achievements(appid, "steamcommunity", achievements)
+    return achievements
 
-        achievements = []
-        achievement_rows = soup.select('.achieveRow')
+def fetch_from_steamcommunity(appid: str, silent: bool = False, cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False,
+                              output_dir: str = ".") -> List[Dict]:
+    session = create_session("steam")
+    
+    try:
+        achievements = get_steamcommunity_achievements(appid, silent, cache_ttl, force, session)
         
         if not silent:
-            print(f"Found {len(achievement_rows)} achievements")
-
-        for idx, achievement in enumerate(achievement_rows):
-            img_tag = achievement.select_one('.achieveImgHolder img')
-            icon = ""
-            if img_tag and img_tag.get('src'):
-                icon_src = str(img_tag['src'])
-                icon = icon_src.split('/')[-1]
+            print(f"Found {len(achievements)} achievements")
+
+        # Download images using the same session
+        report_image_failures(save_achievements(appid, achievements, session, silent, output_dir))
+        
+    finally:
+        session.close()
+    
+    return achievements
+
+def parse_schema_achievements(schema: Dict) -> List[Dict]:
+    achievements = []
+    for achievement in schema.get('game', {}).get('availableGameStats', {}).get('achievements', []):
+        achievements.append({
+            "description": achievement.get('description', ''),
+            "displayName": achievement.get('displayName', ''),
+            "hidden": int(achievement.get('hidden', 0)),
+            "icon": f"images/{achievement.get('icon', '').split('/')[-1]}",
+            "icongray": f"images/{achievement.get('icongray', '').split('/')[-1]}",
+            "name": achievement.get('name', '')
+        })
+    return achievements
+
+# Steam Web API schema: real API names and gray icons from one JSON request, needs a Web API key
+def fetch_from_steamapi(appid: str, api_key: str, silent: bool = False, cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False,
+                        output_dir: str = ".") -> List[Dict]:
+    if not api_key:
+        raise ValueError("A Steam Web API key is required")
+    
+    session = create_session("steam")
+    
+    try:
+        achievements = None if force else load_cached_achievements(appid, "steamapi", cache_ttl)
+        if achievements is not None:
+            if not silent:
+                print("Using cached Steam Web API achievements...")
+        else:
+            if not silent:
+                print("Fetching achievements from the Steam Web API...")
             
-            name_tag = achievement.select_one('.achieveTxt h3')
-            displayName = name_tag.text.strip() if name_tag else ""
+            url = f"{STEAM_API_URL}/ISteamUserStats/GetSchemaForGame/v2/"
+            response = mk_request(url, session, params={"key": api_key, "appid": appid, "l": "english"})
+            if response.status_code != 200:
+                raise RuntimeError(f"GetSchemaForGame returned HTTP {response.status_code}")
             
-            description_tag = achievement.select_one('.achieveTxt h5')
-            description = description_tag.text.strip() if description_tag else ""
-            hidden = 1 if description == "" else 0
-
-            achievements.append({
-                "description": description,
-                "displayName": displayName,
-                "hidden": hidden,
-                "icon": f"images/{icon}",
-                "icongray": f"images/{icon}",
-                "name": f"ach{idx + 1}"
-            })
-
-        with open('achievements.json', 'w', encoding='utf-8') as json_file:
-            json.dump(achievements, json_file, indent=2, ensure_ascii=False)
+            achievements = parse_schema_achievements(response.json())
+            if achievements:
+                store_cached_achievements(appid, "steamapi", achievements)
         
-        # Download images using the same session
-        download_images(appid, achievements, session, silent)
+        if not silent:
+            print(f"Found {len(achievements)} achievements")
         
+        report_image_failures(save_achievements(appid, achievements, session, silent, output_dir))
+        
+    finally:
+        session.close()
+    
+    return achievements
+
+# Seconds the preferred source gets before the other source's result is taken; covers a SteamDB
+# attempt end to end: the clearance request, launching Chromium and navigating, then the page wait
+BROWSER_LAUNCH_TIME = 10
+SOURCE_DEADLINE = CLEARANCE_TIMEOUT + BROWSER_LAUNCH_TIME + STEAMDB_TIMEOUT
+
+# Run both scrapers at once and keep the preferred result if it arrives within the deadline
+def race_sources(appid: str, prefer: str, deadline: float, silent: bool, cache_ttl: float, force: bool) -> tuple:
+    other = "steamcommunity" if prefer == "steamdb" else "steamdb"
+    scraper = CF_Scraper(hide_window=True, pool=USE_BROWSER_POOL or None)
+    
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    futures = {    # Steam Community first, it is a single request and needs no browser
+        "steamcommunity": executor.submit(get_steamcommunity_achievements, appid, True, cache_ttl, force),
+        "steamdb": executor.submit(get_steamdb_achievements, appid, True, cache_ttl, force, scraper),
+    }
+    
+    try:
+        # Preferred within the deadline, then whatever the other source has, then the preferred one without a deadline
+        answered = {}
+        for source, timeout in ((prefer, deadline), (other, None), (prefer, None)):
+            if source in answered:
+                continue
+            try:
+                achievements = futures[source].result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                if not silent:
+                    print(f"{source} did not answer within {deadline}s, trying {other}...")
+                continue
+            except Exception as e:
+                if not silent:
+                    print(f"{source} failed: {e}")
+                achievements = None
+            
+            answered[source] = achievements
+            if achievements:
+                return achievements, source
+        
+        # Both sources answered and at least one with an empty list: the game has no achievements
+        if prefer in answered and other in answered:
+            for source in (prefer, other):
+                if answered[source] is not None:
+                    return answered[source], source
+        raise RuntimeError("No source returned any achievements")
+    
+    finally:
+        # Drop the loser: quitting the browser aborts a SteamDB scrape, a Steam Community request just finishes unused
+        for future in futures.values():
+            future.cancel()
+        scraper.cancel()
+        executor.shutdown(wait=False)
+
+# Fetch from whichever of SteamDB / Steam Community answers first, preferring `prefer`
+def fetch_achievements(appid: str, prefer: str = "steamdb", deadline: float = SOURCE_DEADLINE, silent: bool = False,
+                       cache_ttl: float = ACHIEVEMENT_CACHE_TTL, force: bool = False, output_dir: str = ".") -> List[Dict]:
+    if prefer not in ("steamdb", "steamcommunity"):
+        raise ValueError(f"Unknown achievement source: {prefer}")
+    
+    achievements = None if force else load_cached_achievements(appid, prefer, cache_ttl)
+    source = prefer
+    if achievements is None:
+        if not silent:
+            print("Fetching achievements from SteamDB and Steam Community...")
+        achievements, source = race_sources(appid, prefer, deadline, silent, cache_ttl, force)
+    
+    if not silent:
+        print(f"Found {len(achievements)} achievements on {source}")
+    
+    session = create_session("steam")
+    try:
+        report_image_failures(save_achievements(appid, achievements, session, silent, output_dir))
     finally:
         session.close()
     
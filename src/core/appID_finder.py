@@ -1,83 +1,614 @@
 import os
+import re
+import json
+import math
+import codecs
+import time
 import sqlite3
+import threading
+import concurrent.futures
+from collections import OrderedDict
 from curl_cffi import requests
+from src.core.rate_limiter import limited_get
+from src.core.compact_index import COMPACT_INDEX_NAME, CompactAppIndex, build_compact_index
 
-def get_steam_data(output_dir='assets'):
-    os.makedirs(output_dir, exist_ok=True)
-    db_file = os.path.join(output_dir, 'steam_data.db')
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v0002/"
+APP_CHANGES_URL = "https://api.steampowered.com/IStoreService/GetAppList/v1/"
+INSERT_BATCH_SIZE = 5000
+REFRESH_MAX_AGE = 24 * 60 * 60    # Seconds before the local app list is refreshed
+MISS_TTL = 24 * 60 * 60    # Seconds a failed network lookup is remembered
+LRU_SIZE = 1024
+SQL_CHUNK_SIZE = 500    # Bound parameters per IN (...) query
+STORE_WORKERS = 8
+FUZZY_MIN_OVERLAP = 0.6    # Share of the query's trigrams a fuzzy match has to contain
+FUZZY_CANDIDATES = 200    # Rows read per trigram in the fuzzy and near-exact stages
+DB_NAME = 'steam_data.db'
+
+SEARCH_INDEX_SQL = [
+    '''CREATE INDEX IF NOT EXISTS apps_name_nocase ON apps (name COLLATE NOCASE)''',
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS apps_fts USING fts5(name, content='apps', content_rowid='appid', tokenize='trigram')''',
+    '''CREATE TRIGGER IF NOT EXISTS apps_fts_ai AFTER INSERT ON apps BEGIN
+        INSERT INTO apps_fts (rowid, name) VALUES (new.appid, new.name);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS apps_fts_ad AFTER DELETE ON apps BEGIN
+        INSERT INTO apps_fts (apps_fts, rowid, name) VALUES ('delete', old.appid, old.name);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS apps_fts_au AFTER UPDATE ON apps BEGIN
+        INSERT INTO apps_fts (apps_fts, rowid, name) VALUES ('delete', old.appid, old.name);
+        INSERT INTO apps_fts (rowid, name) VALUES (new.appid, new.name);
+    END''',
+]
+
+# Case and punctuation insensitive form of a game name ("Half-Life: 2" -> "halflife2")
+def normalize_name(name):
+    return re.sub(r'\W+', '', name.casefold())
+
+# Lowercase trigrams without whitespace, the ones that carry signal in the trigram index
+# within_words: only trigrams inside a run of word characters, which survive added punctuation or spacing
+def name_trigrams(name, within_words=False):
+    parts = re.findall(r'\w+', name.lower()) if within_words else name.lower().split()
+    return {part[i:i + 3] for part in parts for i in range(len(part) - 2)}
+
+def fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+# Incrementally decode {"appid", "name"} entries from a streamed GetAppList response
+def iter_app_list(chunks):
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+    in_list = False
     
-    conn = sqlite3.connect(db_file)
+    for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        pos = 0
+        
+        # Skip ahead to the start of the "apps" array
+        if not in_list:
+            key_pos = buffer.find('"apps"')
+            start = buffer.find('[', key_pos) if key_pos != -1 else -1
+            if start == -1:
+                continue
+            in_list = True
+            pos = start + 1
+        
+        # Fast path: decode every complete entry in the chunk with one json.loads
+        end = buffer.rfind('}') + 1
+        if end > pos:
+            try:
+                yield from json.loads('[' + buffer[pos:end].strip(' \t\r\n,') + ']')
+                pos = end
+            except json.JSONDecodeError:
+                pass    # A '}' inside a name split the chunk, decode entry by entry
+        
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                app, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break    # Entry is split across chunks, wait for more data
+            yield app
+        
+        buffer = buffer[pos:]
+
+# Bulk insert the app list in batches inside a single transaction
+def ingest_app_list(conn, apps, batch_size=INSERT_BATCH_SIZE):
     cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS apps (appid INTEGER PRIMARY KEY, name TEXT)''')
+    # The connection outlives the import, so its settings are put back afterwards
+    previous = {pragma: cursor.execute(f'PRAGMA {pragma}').fetchone()[0] for pragma in ('synchronous', 'temp_store', 'cache_size')}
+    cursor.execute('PRAGMA synchronous = OFF')
+    cursor.execute('PRAGMA temp_store = MEMORY')
+    cursor.execute('PRAGMA cache_size = -65536')
     
-    cursor.execute('SELECT COUNT(*) FROM apps')
-    if cursor.fetchone()[0] == 0:
-        api = "https://api.steampowered.com/ISteamApps/GetAppList/v0002/"
-        response = requests.get(api, timeout=30)
-        app_list = response.json()['applist']['apps']
-        
-        cursor.execute('BEGIN TRANSACTION')
-        for app in app_list:
-            cursor.execute('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', (app['appid'], app['name']))
+    total = 0
+    batch = []
+    try:
+        cursor.execute('BEGIN')
+        for app in apps:
+            batch.append((app['appid'], app['name']))
+            if len(batch) >= batch_size:
+                cursor.executemany('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', batch)
+                total += len(batch)
+                batch.clear()
+        if batch:
+            cursor.executemany('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', batch)
+            total += len(batch)
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        for pragma, value in previous.items():
+            cursor.execute(f'PRAGMA {pragma} = {int(value)}')
     
-    return conn
+    return total
 
-def get_steam_app_by_name(app_name):
-    conn = get_steam_data()
+# Insert new apps and rename changed ones, committing per batch to keep write locks short
+def upsert_apps(conn, apps, batch_size=INSERT_BATCH_SIZE):
+    total = 0
+    batch = []
+    for app in apps:
+        batch.append((app['appid'], app['name']))
+        if len(batch) >= batch_size:
+            total += len(batch)
+            with conn:
+                conn.executemany('''INSERT INTO apps (appid, name) VALUES (?, ?)
+                    ON CONFLICT (appid) DO UPDATE SET name = excluded.name WHERE name IS NOT excluded.name''', batch)
+            batch.clear()
+    if batch:
+        total += len(batch)
+        with conn:
+            conn.executemany('''INSERT INTO apps (appid, name) VALUES (?, ?)
+                ON CONFLICT (appid) DO UPDATE SET name = excluded.name WHERE name IS NOT excluded.name''', batch)
+    return total
+
+# Full app list, streamed
+def stream_app_list():
+    response = limited_get(requests, APP_LIST_URL, timeout=30, stream=True)
     try:
-        cursor = conn.cursor()
-        cursor.execute('''SELECT appid, name FROM apps WHERE LOWER(name) = LOWER(?)''', (app_name,))
-        result = cursor.fetchone()
+        response.raise_for_status()
+        yield from iter_app_list(response.iter_content(chunk_size=65536))
+    finally:
+        response.close()
+
+# Apps added or changed since a unix timestamp (IStoreService needs a Web API key)
+def stream_app_changes(api_key, since):
+    last_appid = 0
+    while True:
+        params = {
+            'key': api_key, 'if_modified_since': int(since), 'last_appid': last_appid, 'max_results': 50000,
+            'include_games': 1, 'include_dlc': 1, 'include_software': 1, 'include_videos': 1, 'include_hardware': 1,
+        }
+        response = limited_get(requests, APP_CHANGES_URL, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json().get('response', {})
+        
+        yield from data.get('apps', [])
+        if not data.get('have_more_results') or not data.get('last_appid'):
+            break
+        last_appid = data['last_appid']
+
+# Small thread-safe LRU for resolved lookups
+class LRUCache:
+    def __init__(self, maxsize=LRU_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+# Process-wide handle on steam_data.db
+# Each thread keeps one open connection; WAL lets them read while another thread writes
+class AppIndex:
+    def __init__(self, output_dir='assets'):
+        self.db_file = os.path.abspath(os.path.join(output_dir, DB_NAME))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ready = False
+        self.has_fts = False
+        self.hits = LRUCache()
         
-        if result:
-            return {'appid': result[0], 'name': result[1]}
+        # Optional memory-mapped index for lookups that never open SQLite
+        self.compact_file = os.path.join(os.path.dirname(self.db_file), COMPACT_INDEX_NAME)
+        self.use_compact_index = False
+        self._compact = None
+        self._compact_checked = False
         
-        # If no match, searching
-        try:
-            search_url = f"https://steamcommunity.com/actions/SearchApps/{app_name}"
-            response = requests.get(search_url, timeout=30)
-            search_results = response.json()
+        # Background refresh settings, see configure()
+        self.api_key = None
+        self.max_age = REFRESH_MAX_AGE
+        self._next_refresh_check = 0.0
+        self._refresh_thread = None
+
+    # api_key enables delta refreshes; max_age=None disables background refreshes
+    # compact_index keeps steam_apps.idx built next to the database
+    def configure(self, api_key=None, max_age=REFRESH_MAX_AGE, compact_index=False):
+        self.api_key = api_key or None
+        self.max_age = max_age
+        self.use_compact_index = compact_index
+        self._next_refresh_check = 0.0
+        return self
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    # Connection owned by the calling thread
+    @property
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    # Create the schema and download the app list once per database
+    def ensure_ready(self):
+        if self._ready:
+            self._maybe_refresh()
+            return self
+        
+        with self._lock:
+            if self._ready:
+                return self
             
-            for result in search_results:
-                if result['name'].lower() == app_name.lower():
-                    cursor.execute('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', (result['appid'], result['name']))
-                    conn.commit()
-                    return {'appid': result['appid'], 'name': result['name']}
+            conn = self.conn
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS apps (appid INTEGER PRIMARY KEY, name TEXT)''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS misses (kind TEXT, query TEXT, expires_at REAL, PRIMARY KEY (kind, query))''')
+            
+            if self.get_meta('populated') != '1':
+                # Databases created before the flag existed only need a probe
+                if conn.execute('SELECT 1 FROM apps LIMIT 1').fetchone() is None:
+                    started = time.time()
+                    ingest_app_list(conn, stream_app_list())
+                    self.set_meta('last_sync', int(started))
+                self.set_meta('populated', 1)
+            
+            self._ensure_search_index()
+            self._ready = True
+        
+        self._maybe_refresh()
+        return self
+
+    # Cheap staleness check on the lookup path, the refresh itself never blocks a lookup
+    def _maybe_refresh(self):
+        now = time.time()
+        if now < self._next_refresh_check:
+            return
+        self._next_refresh_check = now + 60
+        
+        last_sync = float(self.get_meta('last_sync', 0))
+        sync_apps = self.max_age is not None and now - last_sync > self.max_age
+        if sync_apps or (self.use_compact_index and self.get_compact_index() is None):
+            self.refresh(sync_apps)
+
+    # Start a background refresh (if one isn't already running) and return its thread
+    def refresh(self, sync_apps=True):
+        with self._lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(target=self._refresh, args=(sync_apps,), name="AppIndexRefresh", daemon=True)
+                self._refresh_thread.start()
+            return self._refresh_thread
+
+    def _refresh(self, sync_apps):
+        started = time.time()
+        try:
+            if sync_apps:
+                last_sync = float(self.get_meta('last_sync', 0))
+                if self.api_key and last_sync:
+                    changes = stream_app_changes(self.api_key, last_sync)
+                else:
+                    changes = stream_app_list()    # No delta endpoint without a key
                 
+                upsert_apps(self.conn, changes)
+                self.set_meta('last_sync', int(started))
+                self.hits.clear()    # Drop names that may have been renamed
+            
+            if self.use_compact_index:
+                self.build_compact_index()
         except Exception as e:
-            print(f"Search error: {e}")
+            self._next_refresh_check = time.time() + 60 * 60    # Don't retry on every lookup while offline
+            print(f"App list refresh failed: {e}")
+
+    # Memory-mapped index if enabled, present and fresh, else None and callers use SQLite
+    # (a file left from an earlier run isn't kept up to date while the option is off)
+    def get_compact_index(self):
+        if not self.use_compact_index:
+            return None
+        compact = self._compact
+        if compact is None and not self._compact_checked:
+            self._compact_checked = True
+            try:
+                compact = self._compact = CompactAppIndex(self.compact_file)
+            except Exception:
+                return None
+        if compact is not None and compact.is_stale(self.max_age):
+            return None
+        return compact
+
+    def build_compact_index(self):
+        self._compact = None    # Release our mapping so the file can be replaced on Windows
+        count = build_compact_index(self.db_file, self.compact_file)
+        self._compact_checked = False
+        return count
+
+    # Name indexes are built after the bulk load so it doesn't pay for per-row trigger work
+    def _ensure_search_index(self):
+        conn = self.conn
+        try:
+            with conn:
+                for statement in SEARCH_INDEX_SQL:
+                    conn.execute(statement)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5/trigram, search falls back to LIKE scans
+            with conn:
+                conn.execute(SEARCH_INDEX_SQL[0])
+            return
+        
+        if self.get_meta('fts_built') != '1':
+            with conn:
+                conn.execute('''INSERT INTO apps_fts (apps_fts) VALUES ('rebuild')''')
+            self.set_meta('fts_built', 1)
+
+    def find_by_id(self, appid):
+        row = self.ensure_ready().conn.execute('SELECT name FROM apps WHERE appid = ?', (int(appid),)).fetchone()
+        return {'appid': int(appid), 'name': row[0]} if row else None
+
+    def find_by_name(self, app_name):
+        row = self.ensure_ready().conn.execute('''SELECT appid, name FROM apps WHERE name = ? COLLATE NOCASE''', (app_name,)).fetchone()
+        return {'appid': row[0], 'name': row[1]} if row else None
+
+    # Name that differs only in punctuation or spacing, e.g. "Half Life 2" for "Half-Life 2"
+    # Candidates must contain every in-word trigram of the query, so this is an AND lookup
+    def find_by_normalized_name(self, app_name):
+        conn = self.ensure_ready().conn
+        trigrams = name_trigrams(app_name, within_words=True)
+        if not self.has_fts or not trigrams:
+            return None
+        
+        wanted = normalize_name(app_name)
+        rows = conn.execute('''SELECT rowid, name FROM apps_fts WHERE apps_fts MATCH ? LIMIT ?''',
+                            (' AND '.join(fts_phrase(t) for t in sorted(trigrams)), FUZZY_CANDIDATES))
+        return next(({'appid': appid, 'name': name} for appid, name in rows if normalize_name(name) == wanted), None)
+
+    # Names sharing at least FUZZY_MIN_OVERLAP of the query's trigrams, best overlap first
+    # A name sharing `need` of n trigrams contains one of any n - need + 1 of them, so only the
+    # rarest ones are read (each capped at FUZZY_CANDIDATES rows) and the candidates scored here
+    def _fuzzy_search(self, conn, query, limit):
+        trigrams = name_trigrams(query)
+        if not trigrams:
+            return []
+        need = min(len(trigrams), max(2, math.ceil(len(trigrams) * FUZZY_MIN_OVERLAP)))
+        
+        counts = {t: conn.execute('''SELECT count(*) FROM (SELECT 1 FROM apps_fts WHERE apps_fts MATCH ? LIMIT ?)''',
+                                  (fts_phrase(t), FUZZY_CANDIDATES)).fetchone()[0] for t in trigrams}
+        rarest = [t for t in sorted(trigrams, key=lambda t: (counts[t], t))[:len(trigrams) - need + 1] if counts[t]]
+        
+        candidates = set()
+        for trigram in rarest:
+            candidates.update(rowid for (rowid,) in conn.execute('''SELECT rowid FROM apps_fts WHERE apps_fts MATCH ? LIMIT ?''',
+                                                                 (fts_phrase(trigram), FUZZY_CANDIDATES)))
+        
+        # Ranked by the share of trigrams the two names have in common, shorter names first on ties
+        scored = []
+        for appid, app in self.find_by_ids(candidates).items():
+            name_grams = name_trigrams(app['name'])
+            shared = len(trigrams & name_grams)
+            if shared >= need:
+                scored.append((-shared / len(trigrams | name_grams), len(app['name']), appid, app['name']))
+        return [(appid, name) for _, _, appid, name in sorted(scored)[:limit]]
+
+    # Resolve many AppIDs with one IN (...) query per chunk
+    def find_by_ids(self, appids):
+        conn = self.ensure_ready().conn
+        appids = list(appids)
+        found = {}
+        for i in range(0, len(appids), SQL_CHUNK_SIZE):
+            chunk = appids[i:i + SQL_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for appid, name in conn.execute(f'''SELECT appid, name FROM apps WHERE appid IN ({placeholders})''', chunk):
+                found[appid] = {'appid': appid, 'name': name}
+        return found
+
+    # Ranked matches: exact, then prefix, then substring, then trigram-overlap (typo tolerant)
+    def search(self, query, limit=10):
+        conn = self.ensure_ready().conn
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        
+        matches = {}
+        def collect(sql, params):
+            for appid, name in conn.execute(sql, params):
+                if len(matches) >= limit:
+                    break
+                matches.setdefault(appid, name)
+        
+        like = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        collect('''SELECT appid, name FROM apps WHERE name = ? COLLATE NOCASE''', (query,))
+        if len(matches) < limit:
+            collect('''SELECT appid, name FROM apps WHERE name LIKE ? ESCAPE '\\' ORDER BY length(name) LIMIT ?''', (like + '%', limit))
+        
+        if len(matches) < limit and self.has_fts and len(query) >= 3:
+            collect('''SELECT rowid, name FROM apps_fts WHERE apps_fts MATCH ? ORDER BY rank LIMIT ?''', (fts_phrase(query), limit))
+            if len(matches) < limit:
+                for appid, name in self._fuzzy_search(conn, query, limit):
+                    if len(matches) >= limit:
+                        break
+                    matches.setdefault(appid, name)
+        
+        elif len(matches) < limit:
+            collect('''SELECT appid, name FROM apps WHERE name LIKE ? ESCAPE '\\' ORDER BY length(name) LIMIT ?''', ('%' + like + '%', limit))
+        
+        return [{'appid': appid, 'name': name} for appid, name in matches.items()]
+
+    # Negative results from the network, remembered across runs until they expire
+    def known_misses(self, kind, queries):
+        conn = self.ensure_ready().conn
+        queries = [str(q) for q in queries]
+        misses = set()
+        for i in range(0, len(queries), SQL_CHUNK_SIZE):
+            chunk = queries[i:i + SQL_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'''SELECT query FROM misses WHERE kind = ? AND expires_at > ? AND query IN ({placeholders})''', (kind, time.time(), *chunk))
+            misses.update(row[0] for row in rows)
+        return misses
+
+    def is_known_miss(self, kind, query):
+        row = self.ensure_ready().conn.execute('''SELECT expires_at FROM misses WHERE kind = ? AND query = ?''', (kind, str(query))).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def remember_miss(self, kind, query, ttl=MISS_TTL):
+        conn = self.ensure_ready().conn
+        now = time.time()
+        with conn:
+            conn.execute('''DELETE FROM misses WHERE expires_at <= ?''', (now,))
+            conn.execute('''INSERT OR REPLACE INTO misses (kind, query, expires_at) VALUES (?, ?, ?)''', (kind, str(query), now + ttl))
+
+    def add(self, appid, name):
+        conn = self.ensure_ready().conn
+        with conn:
+            conn.execute('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', (int(appid), name))
+
+_app_index = None
+_app_index_lock = threading.Lock()
+
+# Shared AppIndex for the whole process
+def get_app_index(output_dir='assets'):
+    global _app_index
+    if _app_index is None:
+        with _app_index_lock:
+            if _app_index is None:
+                _app_index = AppIndex(output_dir)
+    return _app_index
+
+def search_apps(query, limit=10):
+    return get_app_index().search(query, limit)
+
+def get_steam_app_by_name(app_name):
+    index = get_app_index()
+    key = ('name', app_name.casefold())
+    if cached := index.hits.get(key):
+        return dict(cached)
+    
+    result = index.find_by_name(app_name) or index.find_by_normalized_name(app_name)
+    if result:
+        index.hits.put(key, result)
+        return dict(result)
+    
+    if index.is_known_miss('name', key[1]):
         return None
     
-    finally:
-        conn.close()
-
-def get_steam_app_by_id(appid):
-    conn = get_steam_data()
+    # If no match, searching
     try:
-        cursor = conn.cursor()
-        cursor.execute('SELECT name FROM apps WHERE appid = ?', (int(appid),))
-        result = cursor.fetchone()
+        search_url = f"https://steamcommunity.com/actions/SearchApps/{app_name}"
+        response = limited_get(requests, search_url, timeout=30)
+        search_results = response.json()
         
-        if result:
-            return {'appid': int(appid), 'name': result[0]}
+        for result in search_results:
+            if result['name'].lower() == app_name.lower():
+                index.add(result['appid'], result['name'])
+                index.hits.put(key, {'appid': result['appid'], 'name': result['name']})
+                return {'appid': result['appid'], 'name': result['name']}
         
-        # If not found, try Steam store
-        try:
-            store_url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
-            response = requests.get(store_url, timeout=30)
-            store_data = response.json()
-            
-            if str(appid) in store_data and store_data[str(appid)]['success']:
-                app_details = store_data[str(appid)]['data']
-                name = app_details.get('name', 'Unknown')
-                cursor.execute('''INSERT OR IGNORE INTO apps (appid, name) VALUES (?, ?)''', (int(appid), name))
-                conn.commit()
-                return {'appid': int(appid), 'name': name}
+        # Only a definitive answer is remembered, transient errors are retried next time
+        index.remember_miss('name', key[1])
             
-        except Exception as e:
-            print(f"Search error: {e}")
+    except Exception as e:
+        print(f"Search error: {e}")
+    return None
+
+# Look up one AppID on the Steam store
+# Returns (name, definitive): name is None on a miss, definitive is False if the request itself failed
+def fetch_store_app(appid, session=None):
+    try:
+        store_url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
+        response = limited_get(session or requests, store_url, retries=2, timeout=30)
+        store_data = response.json()
+        
+        if str(appid) in store_data and store_data[str(appid)]['success']:
+            app_details = store_data[str(appid)]['data']
+            return app_details.get('name', 'Unknown'), True
         
+        # Store answered "success": false, the app is delisted or doesn't exist
+        return None, str(appid) in store_data
+        
+    except Exception as e:
+        print(f"Search error: {e}")
+        return None, False
+
+def get_steam_app_by_id(appid):
+    index = get_app_index()
+    key = ('id', int(appid))
+    if cached := index.hits.get(key):
+        return dict(cached)
+    
+    compact = index.get_compact_index()
+    result = (compact and compact.find_by_id(key[1])) or index.find_by_id(appid)
+    if result:
+        index.hits.put(key, result)
+        return dict(result)
+    
+    if index.is_known_miss('id', key[1]):
         return None
-    finally:
-        conn.close()
\ No newline at end of file
+    
+    # If not found, try Steam store
+    name, definitive = fetch_store_app(appid)
+    if name is not None:
+        index.add(appid, name)
+        index.hits.put(key, {'appid': int(appid), 'name': name})
+        return {'appid': int(appid), 'name': name}
+    
+    if definitive:
+        index.remember_miss('id', key[1])
+    return None
+
+# Resolve many AppIDs at once: local hits in chunked queries, only the misses go to the store
+# Returns {appid: {'appid', 'name'} or None}
+def get_steam_apps_by_ids(appids, max_workers=STORE_WORKERS):
+    index = get_app_index()
+    appids = list(dict.fromkeys(int(appid) for appid in appids))
+    results = {}
+    
+    compact = index.get_compact_index()
+    pending = []
+    for appid in appids:
+        if cached := index.hits.get(('id', appid)) or (compact and compact.find_by_id(appid)):
+            results[appid] = dict(cached)
+        else:
+            pending.append(appid)
+    
+    for appid, result in index.find_by_ids(pending).items():
+        index.hits.put(('id', appid), result)
+        results[appid] = dict(result)
+    
+    known_misses = index.known_misses('id', [appid for appid in pending if appid not in results])
+    to_fetch = [appid for appid in pending if appid not in results and str(appid) not in known_misses]
+    
+    if to_fetch:
+        with requests.Session() as session:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = executor.map(lambda appid: fetch_store_app(appid, session), to_fetch)
+                for appid, (name, definitive) in zip(to_fetch, fetched):
+                    if name is not None:
+                        index.add(appid, name)
+                        index.hits.put(('id', appid), {'appid': appid, 'name': name})
+                        results[appid] = {'appid': appid, 'name': name}
+                    elif definitive:
+                        index.remember_miss('id', appid)
+    
+    return {appid: results.get(appid) for appid in appids}
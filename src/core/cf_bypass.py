@@ -1,27 +1,37 @@
+import os
 import time
+import atexit
 import ctypes
+import threading
+import concurrent.futures
+from collections import deque
 from ctypes import wintypes
 from DrissionPage import ChromiumPage, ChromiumOptions
 from src.core.threadManager import ThreadManager
+from src.core.cf_clearance import store_clearance
 
 # ========== Win32 Setup ==========
-user32 = ctypes.WinDLL('user32', use_last_error=True)
-WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-
-EnumWindows = user32.EnumWindows
-EnumWindows.argtypes = [WNDENUMPROC, wintypes.LPARAM]
-GetWindowTextW = user32.GetWindowTextW
-GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
-GetClassNameW = user32.GetClassNameW
-GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
-IsWindowVisible = user32.IsWindowVisible
-IsWindowVisible.argtypes = [wintypes.HWND]
-ShowWindow = user32.ShowWindow
-ShowWindow.argtypes = [wintypes.HWND, ctypes.c_int]
+# Window hiding is Windows-only; elsewhere there are no windows to find and the module still imports
+user32 = ctypes.WinDLL('user32', use_last_error=True) if os.name == 'nt' else None
+WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM) if user32 else None
+
+if user32:
+    EnumWindows = user32.EnumWindows
+    EnumWindows.argtypes = [WNDENUMPROC, wintypes.LPARAM]
+    GetWindowTextW = user32.GetWindowTextW
+    GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    GetClassNameW = user32.GetClassNameW
+    GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    IsWindowVisible = user32.IsWindowVisible
+    IsWindowVisible.argtypes = [wintypes.HWND]
+    ShowWindow = user32.ShowWindow
+    ShowWindow.argtypes = [wintypes.HWND, ctypes.c_int]
 
 # Get all visible Chrome window handles
 def get_chrome_windows():
     windows = []
+    if user32 is None:
+        return windows
     @WNDENUMPROC
     def enum_proc(hwnd, _):
         if IsWindowVisible(hwnd):
@@ -38,6 +48,8 @@ def get_chrome_windows():
 
 # Monitor for new Chrome windows and hide them
 def monitor_and_hide(existing_set, duration=3):
+    if user32 is None:
+        return None
     start = time.time()
     while time.time() - start < duration:
         for hwnd in get_chrome_windows():
@@ -47,15 +59,64 @@ def monitor_and_hide(existing_set, duration=3):
         time.sleep(0.05)
     return None
 
+POLL_INTERVAL = 0.1    # Seconds between checks while waiting on the page
+SCRAPE_TIMEOUT = 60    # Seconds a scrape may spend on the challenge and the readiness wait
+CLICK_SETTLE = 2    # Seconds a clicked challenge gets to clear before looking for the button again
+
+# Requests a scrape doesn't need, the HTML carries everything we parse (icons come as data-name)
+# Wildcard patterns for Network.setBlockedURLs. No scripts are matched, and the Turnstile iframe is a
+# cross-origin frame that this list doesn't apply to, so Cloudflare's challenge still loads
+BLOCKED_URLS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico", "*.ico?*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m3u8*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*adservice.google.*", "*amazon-adsystem.com*", "*adnxs.com*", "*scorecardresearch.com*",
+    "*quantserve.com*", "*pubmatic.com*", "*rubiconproject.com*", "*criteo.com*", "*nitropay.com*",
+]
+
+# Per-scrape timings (launch, navigate, bypass, ready, total), newest last
+scrape_timings = deque(maxlen=100)
+
+# Finds the challenge in one evaluation: walks the document and every open shadow root in the page
+# Returns ['iframe', <challenge iframe>] or ['host', <element whose shadow root holds it>]; closed roots are left to CDP
+LOCATE_CHALLENGE_JS = """
+const roots = [document];
+while (roots.length) {
+    const root = roots.pop();
+    for (const el of root.querySelectorAll('*')) {
+        if (el.tagName === 'IFRAME' && /challenges\\.cloudflare\\.com/.test(el.src || '')) return ['iframe', el];
+        if (el.tagName === 'INPUT' && el.type === 'hidden' && (el.name || '').includes('turnstile') && el.parentElement) return ['host', el.parentElement];
+        if (el.shadowRoot) roots.push(el.shadowRoot);
+    }
+}
+return null;
+"""
+
 # ========== CloudflareBypasser ==========
 # Courtesy: https://github.com/sarperavci/CloudflareBypassForScraping
 # Handles Cloudflare challenge bypass
 class CloudflareBypasser:
     
-    __slots__ = ('driver', 'max_retries')
+    __slots__ = ('driver', 'max_retries', 'locate_times')
     def __init__(self, driver: ChromiumPage, max_retries=-1):
         self.driver = driver
         self.max_retries = max_retries
+        self.locate_times = []    # Seconds spent per _locate_button call
+
+    def _challenged(self):
+        return "just a moment" in self.driver.title.lower()
+
+    # Poll until the challenge page is gone, up to `seconds`
+    def _wait_cleared(self, seconds, deadline=None):
+        until = time.monotonic() + seconds
+        if deadline is not None:
+            until = min(until, deadline)
+        while time.monotonic() < until:
+            if not self._challenged():
+                return True
+            time.sleep(POLL_INTERVAL)
+        return not self._challenged()
 
     # Recursively search for Cloudflare iframe in shadow DOM
     def _search_iframe(self, ele):
@@ -81,8 +142,42 @@ class CloudflareBypasser:
                 return result
         return None
     
+    # Locate the challenge with a single in-page walk instead of a CDP round trip per node
+    def _locate_in_page(self):
+        found = self.driver.run_js(LOCATE_CHALLENGE_JS)
+        if not found:
+            return None
+        
+        kind, ele = found
+        iframe = ele
+        if kind == 'host':
+            shadow = ele.shadow_root
+            iframe = shadow.child() if shadow else None
+        if not iframe:
+            return None
+        
+        body = iframe("tag:body")
+        if not body:
+            return None
+        shadow = body.shadow_root
+        if shadow:
+            return shadow("tag:input")
+        return self._search_input(body)
+    
     # Locate Cloudflare challenge button
     def _locate_button(self):
+        started = time.monotonic()
+        try:
+            button = self._locate_in_page()
+        except Exception:
+            button = None
+        if not button:
+            button = self._locate_by_walking()
+        self.locate_times.append(time.monotonic() - started)
+        return button
+    
+    # Fallback for pages the in-page walk can't see into
+    def _locate_by_walking(self):
         try:
             # Fast path: look for turnstile input
             for ele in self.driver.eles("tag:input"):
@@ -106,37 +201,205 @@ class CloudflareBypasser:
             print(f"Error locating button: {e}")
             return None
 
-    # Execute Cloudflare bypass
-    def bypass(self):
+    # Execute Cloudflare bypass; deadline is a time.monotonic() value to give up at
+    def bypass(self, deadline=None):
         tries = 0
-        while "just a moment" in self.driver.title.lower():
+        while self._challenged():
             if 0 < self.max_retries < tries:
                 break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
             
             try:
                 button = self._locate_button()
                 if button:
                     button.click()
-                    time.sleep(2)
+                    self._wait_cleared(CLICK_SETTLE, deadline)
                 else:
-                    time.sleep(1)
+                    self._wait_cleared(1, deadline)
             except Exception as e:
                 print(f"Bypass attempt {tries + 1} failed: {e}")
-                time.sleep(2)
+                self._wait_cleared(CLICK_SETTLE, deadline)
             
             tries += 1
 
+# ========== Browser Pool ==========
+POOL_SIZE = 2
+POOL_IDLE_TIMEOUT = 300    # Seconds an unused browser is kept open
+POOL_MAX_PAGES = 50    # Pages a browser serves before it is replaced
+
+# Launch options for a scraping browser
+def create_options(hide_window=True, auto_port=False):
+    co = ChromiumOptions()
+    if hide_window:
+        co.set_argument('--window-position=-2400,-2400')
+    else:
+        co.set_argument('--window-position=100,100')
+    if auto_port:
+        co.auto_port()    # Own port and profile, otherwise every pooled browser attaches to the same one
+    return co
+
+class PooledBrowser:
+    
+    __slots__ = ('page', 'hide_window', 'tabs', 'pages_served', 'last_used')
+    def __init__(self, page, hide_window):
+        self.page = page
+        self.hide_window = hide_window
+        self.tabs = set()
+        self.pages_served = 0
+        self.last_used = time.monotonic()
+
+# Keeps Chromium, and the cf_clearance cookies it earned, alive across scrapes and hands out tabs
+class BrowserPool:
+    
+    __slots__ = ('size', 'idle_timeout', 'max_pages', '_browsers', '_launching', '_lock', '_reaper')
+    def __init__(self, size=POOL_SIZE, idle_timeout=POOL_IDLE_TIMEOUT, max_pages=POOL_MAX_PAGES):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.max_pages = max_pages
+        self._browsers = []
+        self._launching = 0    # Slots reserved by launches still in progress
+        self._lock = threading.Condition()
+        self._reaper = None
+    
+    def _launch(self, hide_window):
+        # Plain thread for the window monitor, pooled browsers outlive the scraper that launched them
+        if hide_window:
+            existing_windows = set(get_chrome_windows())
+            threading.Thread(target=monitor_and_hide, args=(existing_windows,), daemon=True).start()
+        return PooledBrowser(ChromiumPage(addr_or_opts=create_options(hide_window, auto_port=True)), hide_window)
+    
+    # Quit browsers without open tabs that are idle or used up; call with the lock held
+    def _retire(self):
+        now = time.monotonic()
+        for browser in list(self._browsers):
+            if browser.tabs:
+                continue
+            if browser.pages_served >= self.max_pages or now - browser.last_used >= self.idle_timeout:
+                self._browsers.remove(browser)
+                try:
+                    browser.page.quit()
+                except Exception:
+                    pass
+    
+    def _reap(self):
+        with self._lock:
+            self._reaper = None
+            self._retire()
+            self._schedule_reap()
+    
+    def _schedule_reap(self):
+        if self._reaper is None and self._browsers:
+            self._reaper = threading.Timer(self.idle_timeout, self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+    
+    # Open a tab on the least busy browser, launching a new one while the pool has room
+    def acquire(self, hide_window=True):
+        with self._lock:
+            while True:
+                self._retire()
+                usable = [b for b in self._browsers if b.hide_window == hide_window and b.pages_served < self.max_pages]
+                browser = min(usable, key=lambda b: len(b.tabs), default=None)
+                
+                if len(self._browsers) + self._launching < self.size and (browser is None or browser.tabs):
+                    self._launching += 1
+                    break
+                if browser is not None:
+                    return browser, self.open_tab(browser)
+                self._lock.wait(1)    # Pool is full of browsers that are busy being retired or launched
+        
+        # Launch with only the slot reserved, other callers keep using the warm browsers meanwhile
+        try:
+            browser = self._launch(hide_window)
+        except Exception:
+            with self._lock:
+                self._launching -= 1
+                self._lock.notify_all()
+            raise
+        
+        with self._lock:
+            self._launching -= 1
+            self._browsers.append(browser)
+            self._lock.notify_all()
+            return browser, self.open_tab(browser)
+    
+    # Another tab in a browser already handed out, e.g. to reuse the clearance it just earned
+    def open_tab(self, browser):
+        with self._lock:
+            try:
+                tab = browser.page.new_tab()
+            except Exception:
+                # Browser died underneath us, drop it so the next acquire launches a fresh one
+                if browser in self._browsers:
+                    self._browsers.remove(browser)
+                raise
+            
+            browser.tabs.add(tab.tab_id)
+            browser.pages_served += 1
+            browser.last_used = time.monotonic()
+            self._schedule_reap()
+            return tab
+    
+    # Close the tab and keep the browser warm; safe to call twice for the same tab
+    def release(self, browser, tab):
+        with self._lock:
+            if tab.tab_id not in browser.tabs:
+                return
+            browser.tabs.discard(tab.tab_id)
+        
+        try:
+            tab.close()
+        except Exception:
+            pass
+        
+        with self._lock:
+            browser.last_used = time.monotonic()
+            self._retire()
+            self._lock.notify_all()
+    
+    def close(self):
+        with self._lock:
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            for browser in self._browsers:
+                try:
+                    browser.page.quit()
+                except Exception:
+                    pass
+            self._browsers.clear()
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+# Shared pool for the whole process, its browsers are quit on exit
+def get_browser_pool():
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+            atexit.register(_browser_pool.close)
+        return _browser_pool
+
 # ========== Main Scraper Class ==========
 # Main Scraper class
 class CF_Scraper:
     
-    __slots__ = ('hide_window', 'driver', 'thread_mgr', '_window_monitor_signals')
+    __slots__ = ('hide_window', 'pool', 'block_resources', 'driver', 'thread_mgr', 'timings', '_window_monitor_signals', '_cancelled', '_browser')
     
-    def __init__(self, hide_window=True):
+    # pool: a BrowserPool, or True for the shared one; scrapes then run in a tab of a warm browser
+    # block_resources: skip images, fonts, media and ad/analytics hosts (BLOCKED_URLS) on every page
+    def __init__(self, hide_window=True, pool=None, block_resources=True):
         self.hide_window = hide_window
+        self.pool = get_browser_pool() if pool is True else pool
+        self.block_resources = block_resources
         self.driver = None
+        self._browser = None
         self.thread_mgr = ThreadManager()
+        self.timings = {}
         self._window_monitor_signals = None
+        self._cancelled = False
     
     # Set up window hiding monitoring in background thread
     def _setup_hidden_window(self):
@@ -149,14 +412,82 @@ class CF_Scraper:
     
     # Create and configure ChromiumPage driver
     def _create_driver(self):
-        co = ChromiumOptions()
+        return ChromiumPage(addr_or_opts=create_options(self.hide_window))
+    
+    # Start a dedicated browser for this scrape
+    # The window list is snapshotted before the monitor starts, so it runs alongside the launch with no waits
+    def _launch(self):
+        # Start window monitoring if hiding enabled
         if self.hide_window:
-            co.set_argument('--window-position=-2400,-2400')
+            self._setup_hidden_window()
+        self.driver = self._create_driver()
+    
+    # Whether the page meets a readiness condition: CSS selector, 'js:<expression>' or callable(page)
+    def _is_ready(self, page, ready):
+        if callable(ready):
+            return bool(ready(page))
+        if ready.startswith('js:'):
+            return bool(page.run_js(f"return !!({ready[3:]});"))
+        return bool(page.ele(f"css:{ready}", timeout=0))
+    
+    def _wait_ready(self, page, ready, deadline):
+        while True:
+            try:
+                if self._is_ready(page, ready):
+                    return True
+            except Exception:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+    
+    # Load one URL in a page or tab, get past Cloudflare and return its HTML; timings are filled in as it goes
+    def _load(self, page, url, timings, started, max_retries, page_load_wait, ready, timeout):
+        # Blocking is per tab, so it's set on every page before it navigates
+        if self.block_resources:
+            try:
+                page.set.blocked_urls(BLOCKED_URLS)
+            except Exception:
+                pass
+        
+        # Navigate and bypass Cloudflare
+        page.get(url)
+        timings['navigate'] = time.monotonic() - started
+        deadline = time.monotonic() + timeout
+        bypasser = CloudflareBypasser(page, max_retries=max_retries)
+        bypasser.bypass(deadline)
+        timings['bypass'] = time.monotonic() - started
+        if bypasser.locate_times:
+            timings['locate'] = max(bypasser.locate_times)
+        self._export_clearance(page, url)
+        
+        # Wait for the content the caller needs, or a fixed delay if that's all we were given
+        if ready is not None:
+            if not self._wait_ready(page, ready, deadline):
+                print(f"Page not ready after {timeout}s, returning it as is")
+            timings['ready'] = time.monotonic() - started
+        if page_load_wait > 0:
+            time.sleep(page_load_wait)
+        
+        # Get HTML content
+        html_content = page.html
+        timings['total'] = time.monotonic() - started
+        scrape_timings.append(dict(timings, url=url))
+        return html_content
+    
+    # Dedicated browser, or a tab from the pool
+    def _start(self):
+        # Don't launch a browser for a scrape that was already called off
+        if self._cancelled:
+            raise RuntimeError("Scrape cancelled")
+        if self.pool is not None:
+            self._browser, self.driver = self.pool.acquire(self.hide_window)
         else:
-            co.set_argument('--window-position=100,100')
-        return ChromiumPage(addr_or_opts=co)
+            self._launch()
+        if self._cancelled:
+            raise RuntimeError("Scrape cancelled")
     
-    def scrape(self, url, output_file=None, max_retries=-1, page_load_wait=0):
+    def scrape(self, url, output_file=None, max_retries=-1, page_load_wait=0, ready=None, timeout=SCRAPE_TIMEOUT):
         '''
         Scrape a URL with Cloudflare bypass and optional hidden browser window.
         
@@ -165,34 +496,20 @@ class CF_Scraper:
             output_file (str, optional): File path to save HTML. If None, returns HTML string
             max_retries (int): Max Cloudflare bypass retries (-1 for infinite)
             page_load_wait (int/float): Seconds to wait after page loads before retrieving HTML
+            ready (str/callable, optional): Return as soon as this holds: a CSS selector,
+                'js:<expression>' or a callable taking the page
+            timeout (int/float): Seconds allowed for the bypass and the ready wait together
         
         Returns:
             str: HTML content if output_file is None, otherwise None
         '''
+        started = time.monotonic()
+        self.timings = {}
         try:
-            # Start window monitoring if hiding enabled
-            if self.hide_window:
-                self._setup_hidden_window()
-            
-            # Create driver with small delay for window monitor
-            if self.hide_window:
-                time.sleep(0.1)
-            self.driver = self._create_driver()
-            
-            # Wait for window monitor to complete
-            if self.hide_window:
-                time.sleep(0.5)
+            self._start()
+            self.timings['launch'] = time.monotonic() - started
             
-            # Navigate and bypass Cloudflare
-            self.driver.get(url)
-            CloudflareBypasser(self.driver, max_retries=max_retries).bypass()
-            
-            # Wait for additional page content if requested
-            if page_load_wait > 0:
-                time.sleep(page_load_wait)
-            
-            # Get HTML content
-            html_content = self.driver.html
+            html_content = self._load(self.driver, url, self.timings, started, max_retries, page_load_wait, ready, timeout)
             
             # Save to file or return content
             if output_file:
@@ -202,23 +519,113 @@ class CF_Scraper:
             return html_content
                 
         except Exception as e:
-            print(f"Scraping error: {e}")
+            if not self._cancelled:
+                print(f"Scraping error: {e}")
             raise
         finally:
             self.cleanup()
     
-    # Clean up browser and background threads
+    # Scrape one URL in its own tab of the browser this scraper holds
+    def _scrape_tab(self, url, max_retries, page_load_wait, ready, timeout):
+        if self._cancelled:
+            raise RuntimeError("Scrape cancelled")
+        
+        started = time.monotonic()
+        tab = self.pool.open_tab(self._browser) if self._browser is not None else self.driver.new_tab()
+        try:
+            return self._load(tab, url, {}, started, max_retries, page_load_wait, ready, timeout)
+        finally:
+            try:
+                if self._browser is not None:
+                    self.pool.release(self._browser, tab)
+                else:
+                    tab.close()
+            except Exception:
+                pass
+    
+    def scrape_many(self, urls, concurrency=4, max_retries=-1, page_load_wait=0, ready=None, timeout=SCRAPE_TIMEOUT):
+        '''
+        Scrape several URLs with one browser. The first URL solves Cloudflare, the rest load in
+        up to `concurrency` tabs that share its clearance.
+        
+        Args:
+            urls (iterable): URLs to scrape
+            concurrency (int): Max tabs loading at once
+            max_retries, page_load_wait, ready, timeout: As for scrape(), applied per URL
+        
+        Yields:
+            tuple: (url, html) in completion order; html is None for a URL that failed
+        '''
+        urls = list(urls)
+        if not urls:
+            return
+        
+        executor = None
+        try:
+            started = time.monotonic()
+            self.timings = {}
+            self._start()
+            self.timings['launch'] = time.monotonic() - started
+            
+            # Solve the challenge once, in the scraper's own page
+            try:
+                html_content = self._load(self.driver, urls[0], self.timings, started, max_retries, page_load_wait, ready, timeout)
+            except Exception as e:
+                if self._cancelled:
+                    raise
+                print(f"Scraping error for {urls[0]}: {e}")
+                html_content = None
+            yield urls[0], html_content
+            
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, concurrency))
+            futures = {
+                executor.submit(self._scrape_tab, url, max_retries, page_load_wait, ready, timeout): url
+                for url in urls[1:]
+            }
+            for future in concurrent.futures.as_completed(futures):
+                url = futures[future]
+                try:
+                    html_content = future.result()
+                except Exception as e:
+                    if not self._cancelled:
+                        print(f"Scraping error for {url}: {e}")
+                    html_content = None
+                yield url, html_content
+        
+        finally:
+            # Let running tabs finish closing before the browser goes away
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self.cleanup()
+    
+    # Hand the solved challenge's cookies and user agent to later curl_cffi requests
+    def _export_clearance(self, page, url):
+        try:
+            store_clearance(url, page.user_agent, page.cookies(all_info=True))
+        except Exception:
+            pass
+    
+    # Clean up browser and background threads; a pooled tab is handed back instead
     def cleanup(self):
         if self.driver:
             try:
-                self.driver.quit()
+                if self._browser is not None:
+                    self.pool.release(self._browser, self.driver)
+                else:
+                    self.driver.quit()
             except Exception:
                 pass
             self.driver = None
+            self._browser = None
         
         self.thread_mgr.cleanup()
         self._window_monitor_signals = None
     
+    # Abort a scrape running in another thread by quitting its browser (or closing its pooled tab)
+    def cancel(self):
+        self._cancelled = True
+        self.cleanup()
+    
     def __enter__(self):
         return self
     
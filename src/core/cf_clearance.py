@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from curl_cffi import requests
+from src.core.rate_limiter import limited_get
+
+# Cloudflare clearance solved in the browser, reused by curl_cffi until it expires
+CLEARANCE_FILE = os.path.abspath(os.path.join("assets", "cf_clearance.json"))
+CLEARANCE_TTL = 30 * 60    # Seconds, for a cf_clearance cookie without an expiry of its own
+IMPERSONATE = "chrome"    # cf_clearance is tied to the browser's fingerprint, so look like Chrome
+CLEARANCE_TIMEOUT = 10    # Seconds for a request made with a stored clearance
+
+_clearances = None
+_clearances_lock = threading.Lock()
+
+def _host(url: str) -> str:
+    return urlparse(url).hostname or ""
+
+# Clearances by host, loaded from disk on first use; call with the lock held
+def _load() -> Dict[str, Dict]:
+    global _clearances
+    if _clearances is None:
+        try:
+            with open(CLEARANCE_FILE, 'r', encoding='utf-8') as f:
+                _clearances = json.load(f)
+        except (OSError, ValueError):
+            _clearances = {}
+
+    now = time.time()
+    for host in [h for h, c in _clearances.items() if c.get('expires_at', 0) <= now]:
+        del _clearances[host]
+    return _clearances
+
+def _save():
+    os.makedirs(os.path.dirname(CLEARANCE_FILE), exist_ok=True)
+    tmp_path = f"{CLEARANCE_FILE}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_clearances, f, indent=2)
+    os.replace(tmp_path, CLEARANCE_FILE)
+
+# Keep the cookies and user agent of a browser that got past the challenge
+# cookies: CDP cookie dicts (name, value, domain, expires)
+def store_clearance(url: str, user_agent: str, cookies: List[Dict]) -> bool:
+    clearance = next((c for c in cookies if c.get('name') == 'cf_clearance'), None)
+    if clearance is None or not user_agent:
+        return False
+
+    expires = clearance.get('expires') or 0
+    if expires <= 0:    # Session cookie
+        expires = time.time() + CLEARANCE_TTL
+
+    with _clearances_lock:
+        _load()[_host(url)] = {
+            "user_agent": user_agent,
+            "cookies": [{"name": c['name'], "value": c['value'], "domain": c.get('domain', '')} for c in cookies],
+            "expires_at": expires
+        }
+        _save()
+    return True
+
+def get_clearance(url: str) -> Optional[Dict]:
+    with _clearances_lock:
+        return _load().get(_host(url))
+
+def drop_clearance(url: str):
+    with _clearances_lock:
+        if _load().pop(_host(url), None) is not None:
+            _save()
+
+# Cloudflare answers with 403/503 and an interstitial when the clearance isn't accepted
+def is_challenge(response: requests.Response) -> bool:
+    if response.status_code not in (403, 503):
+        return False
+    return response.headers.get('cf-mitigated') == 'challenge' or b"Just a moment" in response.content[:4096]
+
+# curl_cffi session carrying the stored clearance for the URL's host, None when there is none
+def create_clearance_session(url: str, timeout: float = CLEARANCE_TIMEOUT) -> Optional[requests.Session]:
+    clearance = get_clearance(url)
+    if clearance is None:
+        return None
+
+    headers = {
+        "User-Agent": clearance['user_agent'],
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9"
+    }
+    session = requests.Session(impersonate=IMPERSONATE, headers=headers, timeout=timeout)
+    for cookie in clearance['cookies']:
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
+    return session
+
+# Fetch a page over plain HTTP using the stored clearance
+# Returns None when there is no clearance or Cloudflare rejected it (the clearance is then dropped)
+def clearance_get(url: str, timeout: float = CLEARANCE_TIMEOUT) -> Optional[bytes]:
+    session = create_clearance_session(url, timeout)
+    if session is None:
+        return None
+
+    try:
+        response = limited_get(session, url)
+    except Exception:
+        return None
+    finally:
+        session.close()
+
+    if is_challenge(response):
+        drop_clearance(url)
+        return None
+    if response.status_code != 200:
+        return None
+    return response.content
@@ -0,0 +1,71 @@
+import os
+import mmap
+import time
+import array
+import bisect
+import struct
+import sqlite3
+
+COMPACT_INDEX_NAME = 'steam_apps.idx'
+MAGIC = b'YAGGIDX1'
+# magic, app count, blob size, built at (unix), reserved
+HEADER = struct.Struct('<8sIId4x')
+
+# Write a sorted appid array, name offsets and a UTF-8 name blob from steam_data.db
+def build_compact_index(db_file, index_file):
+    conn = sqlite3.connect(db_file, timeout=30)
+    try:
+        appids = array.array('I')
+        offsets = array.array('I', [0])
+        blob = bytearray()
+        for appid, name in conn.execute('SELECT appid, name FROM apps WHERE appid BETWEEN 0 AND 4294967295 ORDER BY appid'):
+            appids.append(appid)
+            blob += (name or '').encode('utf-8')
+            offsets.append(len(blob))
+    finally:
+        conn.close()
+    
+    tmp_file = f"{index_file}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(appids), len(blob), time.time()))
+        appids.tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+    os.replace(tmp_file, index_file)
+    return len(appids)
+
+# Read-only, memory-mapped view of a compact index; lookups are a binary search, nothing is parsed up front
+class CompactAppIndex:
+    __slots__ = ('path', 'built_at', '_mm', '_appids', '_offsets', '_blob')
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, count, blob_size, self.built_at = HEADER.unpack_from(self._mm)
+        ids_start = HEADER.size
+        offsets_start = ids_start + count * 4
+        blob_start = offsets_start + (count + 1) * 4
+        if magic != MAGIC or blob_start + blob_size > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"Invalid compact app index: {path}")
+        
+        view = memoryview(self._mm)
+        self._appids = view[ids_start:offsets_start].cast('I')
+        self._offsets = view[offsets_start:blob_start].cast('I')
+        self._blob = view[blob_start:blob_start + blob_size]
+    
+    def __len__(self):
+        return len(self._appids)
+    
+    def is_stale(self, max_age):
+        return max_age is not None and time.time() - self.built_at > max_age
+    
+    def find_by_id(self, appid):
+        appid = int(appid)
+        pos = bisect.bisect_left(self._appids, appid)
+        if pos == len(self._appids) or self._appids[pos] != appid:
+            return None
+        name = bytes(self._blob[self._offsets[pos]:self._offsets[pos + 1]]).decode('utf-8')
+        return {'appid': appid, 'name': name}
@@ -1,7 +1,13 @@
 import os
+import json
+import time
+import threading
 import concurrent.futures
 from bs4 import BeautifulSoup
 from curl_cffi import requests
+from src.core.rate_limiter import limited_get
+from src.core.cf_clearance import clearance_get
+from src.core.appID_finder import get_app_index, upsert_apps
 
 def create_session():
     headers = {
@@ -25,45 +31,72 @@ def create_session():
     except Exception:
         return None
 
-def fetch_steam_dlcs(session, app_id):
+STORE_ITEMS_URL = "https://api.steampowered.com/IStoreBrowseService/GetItems/v1/"
+STORE_BATCH_SIZE = 100    # App IDs per GetItems request
+
+# Phase one: the parent's appdetails lists every DLC ID, names come from SteamDB
+# Returns None when the store didn't answer, an empty list when the game has no DLCs
+def fetch_steam_dlc_ids(session, app_id):
     url = f"https://store.steampowered.com/api/appdetails/?filters=basic&appids={app_id}"
     
     try:
-        response = session.get(url, timeout=5)
+        response = limited_get(session, url, retries=2, timeout=5)
         response.raise_for_status()
-        data = response.json()
-        
-        dlc_ids = data[str(app_id)].get('data', {}).get('dlc', [])
-        if not dlc_ids:
-            return {}
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            def fetch_dlc_details(dlc_id):
-                dlc_url = f"https://store.steampowered.com/api/appdetails/?filters=basic&appids={dlc_id}"
-                try:
-                    dlc_response = session.get(dlc_url, timeout=3)
-                    dlc_response.raise_for_status()
-                    dlc_data = dlc_response.json()
-                    
-                    if str(dlc_id) in dlc_data and dlc_data[str(dlc_id)].get('success'):
-                        dlc_name = dlc_data[str(dlc_id)].get('data', {}).get('name', f'DLC {dlc_id}')
-                        return (dlc_id, dlc_name)
-                except Exception:
-                    return None
-            
-            steam_dlcs = dict(filter(None, executor.map(fetch_dlc_details, dlc_ids)))
-        
-        return steam_dlcs
-    
+        data = response.json()[str(app_id)]
+        if not data.get('success'):
+            return None
+        return data.get('data', {}).get('dlc', [])
     except Exception:
-        return {}
+        return None
+
+# Names for many apps per request through IStoreBrowseService/GetItems; returns (names, requests made)
+def fetch_store_names(session, app_ids):
+    names = {}
+    batches = 0
+    for i in range(0, len(app_ids), STORE_BATCH_SIZE):
+        batch = app_ids[i:i + STORE_BATCH_SIZE]
+        input_json = {
+            "ids": [{"appid": app_id} for app_id in batch],
+            "context": {"language": "english", "country_code": "US"}
+        }
+        batches += 1
+        try:
+            response = limited_get(session, STORE_ITEMS_URL, retries=2, timeout=10, params={"input_json": json.dumps(input_json)})
+            response.raise_for_status()
+            for item in response.json().get('response', {}).get('store_items', []):
+                if item.get('success') == 1 and item.get('name'):
+                    names[int(item['appid'])] = item['name']
+        except Exception:
+            pass
+    return names, batches
+
+# Phase two: IDs still without a name are looked up in the local app list, then in batched store calls
+def resolve_dlc_names(session, dlc_ids, stats):
+    names = {}
+    try:
+        local = get_app_index().find_by_ids(dlc_ids)
+        names.update((app_id, app['name']) for app_id, app in local.items() if app.get('name'))
+    except Exception:
+        pass
+    stats['local'] = len(names)
+    
+    missing = [dlc_id for dlc_id in dlc_ids if dlc_id not in names]
+    if missing:
+        store_names, batches = fetch_store_names(session, missing)
+        names.update(store_names)
+        stats['store'] = len(store_names)
+        stats['requests'] += batches
+    return names
 
 def fetch_steamdb_dlcs(session, app_id):
     url = f"https://steamdb.info/app/{app_id}/dlc/"
     
     try:
-        response = session.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Reuse a browser-solved clearance if there is one, otherwise try our luck with the plain session
+        content = clearance_get(url)
+        if content is None:
+            content = limited_get(session, url, timeout=10).content
+        soup = BeautifulSoup(content, 'html.parser')
         
         dlc_section = soup.find("div", {"id": "dlc", "class": "tab-pane selected"})
         if not dlc_section:
@@ -93,24 +126,111 @@ def fetch_steamdb_dlcs(session, app_id):
     except Exception:
         return {}
 
-def fetch_dlc(app_id):
+# Resolve a game's DLCs over the network
+# Returns (dlcs, definitive): {dlc_id: name}, definitive is False if the store's DLC list couldn't be fetched
+def fetch_dlc_from_network(app_id):
+    stats = {'steamdb': 0, 'local': 0, 'store': 0, 'requests': 2}    # appdetails + SteamDB
+    
     with create_session() as session:
         with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            steamapi_future = executor.submit(fetch_steam_dlcs, session, app_id)
+            steamapi_future = executor.submit(fetch_steam_dlc_ids, session, app_id)
             steamdb_future = executor.submit(fetch_steamdb_dlcs, session, app_id)
             
-            steam_dlcs = steamapi_future.result() or {}
+            dlc_ids = steamapi_future.result()
             steamdb_dlcs = steamdb_future.result() or {}
+        
+        unq_dlcs = dict(steamdb_dlcs)
+        stats['steamdb'] = len(unq_dlcs)
+        
+        unnamed = [dlc_id for dlc_id in dict.fromkeys(int(dlc_id) for dlc_id in dlc_ids or []) if dlc_id not in unq_dlcs]
+        if unnamed:
+            names = resolve_dlc_names(session, unnamed, stats)
+            for dlc_id in unnamed:
+                unq_dlcs[dlc_id] = names.get(dlc_id, f"DLC {dlc_id}")
+    
+    if unq_dlcs:
+        unresolved = len(unq_dlcs) - stats['steamdb'] - stats['local'] - stats['store']
+        print(f"{len(unq_dlcs)} DLCs: {stats['steamdb']} named by SteamDB, {stats['local']} from the local app list, "
+              f"{stats['store']} from the store, {unresolved} unnamed ({stats['requests']} requests)")
+    return unq_dlcs, dlc_ids is not None
+
+# DLC lists are kept in steam_data.db per parent AppID
+# A game without DLCs gets a single NO_DLCS row, so it isn't looked up again on every run
+DLC_CACHE_TTL = 24 * 60 * 60    # Seconds before a stored list is refreshed in the background
+NO_DLCS = 0    # dlc_appid of the marker row, AppID 0 is never a DLC
+_dlc_table_ready = False
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _dlc_catalogue():
+    global _dlc_table_ready
+    conn = get_app_index().conn
+    if not _dlc_table_ready:
+        with conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS dlcs (
+                parent_appid INTEGER, dlc_appid INTEGER, name TEXT, fetched_at REAL, PRIMARY KEY (parent_appid, dlc_appid))''')
+        _dlc_table_ready = True
+    return conn
 
-    unq_dlcs = {}
-    all_dlc_sources = [steamdb_dlcs, steam_dlcs]
+# Stored DLCs and when they were fetched, or None if the game has never been resolved
+def load_cached_dlcs(app_id):
+    rows = _dlc_catalogue().execute('''SELECT dlc_appid, name, fetched_at FROM dlcs WHERE parent_appid = ? ORDER BY rowid''',
+                                    (int(app_id),)).fetchall()
+    if not rows:
+        return None
+    return {dlc_id: name for dlc_id, name, _ in rows if dlc_id != NO_DLCS}, min(fetched_at for _, _, fetched_at in rows)
+
+# Replace a game's stored DLCs, and teach the local app list the real names
+def store_cached_dlcs(app_id, dlcs):
+    conn = _dlc_catalogue()
+    now = time.time()
+    with conn:
+        conn.execute('''DELETE FROM dlcs WHERE parent_appid = ?''', (int(app_id),))
+        conn.executemany('''INSERT INTO dlcs (parent_appid, dlc_appid, name, fetched_at) VALUES (?, ?, ?, ?)''',
+                         [(int(app_id), int(dlc_id), name, now) for dlc_id, name in dlcs.items()] or [(int(app_id), NO_DLCS, None, now)])
+    try:
+        upsert_apps(conn, ({'appid': int(dlc_id), 'name': name} for dlc_id, name in dlcs.items() if name != f"DLC {dlc_id}"))
+    except Exception:
+        pass    # App list not built yet
+
+# Network fetch that writes the result back; an empty result is only stored when the store confirmed it
+def refresh_dlcs(app_id):
+    dlcs, definitive = fetch_dlc_from_network(app_id)
+    if dlcs or definitive:
+        store_cached_dlcs(app_id, dlcs)
+    return dlcs
+
+def _refresh_in_background(app_id):
+    with _refreshing_lock:
+        if app_id in _refreshing:
+            return
+        _refreshing.add(app_id)
     
-    for source in all_dlc_sources:
-        for dlc_id, dlc_name in source.items():
-            if dlc_id not in unq_dlcs:
-                unq_dlcs[dlc_id] = dlc_name
+    def run():
+        try:
+            refresh_dlcs(app_id)
+        except Exception as e:
+            print(f"DLC refresh failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(app_id)
+    
+    threading.Thread(target=run, daemon=True).start()
 
-    return unq_dlcs
+# Stored DLCs, possibly none (refreshed in the background once older than max_age), otherwise a network fetch
+def fetch_dlc(app_id, max_age=DLC_CACHE_TTL):
+    try:
+        cached = load_cached_dlcs(app_id)
+    except Exception:
+        cached = None
+    
+    if cached is None:
+        return refresh_dlcs(app_id)
+    
+    dlcs, fetched_at = cached
+    if time.time() - fetched_at > max_age:
+        _refresh_in_background(int(app_id))
+    return dlcs
 
 def create_dlc_config(game_dir, dlc_details):
     if not dlc_details:
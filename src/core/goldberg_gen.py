@@ -1,8 +1,33 @@
 import os
+import re
+import mmap
 import shutil
+import hashlib
+import threading
 import subprocess
 
 EMU_FOLDER = os.path.join("assets", "goldberg_emu")
+INTERFACE_CACHE_DIR = os.path.join("assets", "interface_cache")    # steam_interfaces.txt per DLL SHA-256 and producer
+SCANNER_VERSION = 2    # Bump whenever extract_interfaces' output changes, cached scan results are then redone
+
+# Interface version strings generate_interfaces looks for, in the order it writes them
+# (the tool's pattern list; all but the bare STEAMCONTROLLER_INTERFACE_VERSION need version digits)
+INTERFACE_NAMES = [
+    "SteamClient", "SteamGameServerStats", "SteamGameServer", "SteamMatchMakingServers", "SteamMatchMaking",
+    "SteamUser", "SteamFriends", "SteamUtils", "STEAMUSERSTATS_INTERFACE_VERSION", "STEAMAPPS_INTERFACE_VERSION",
+    "SteamNetworking", "STEAMREMOTESTORAGE_INTERFACE_VERSION", "STEAMSCREENSHOTS_INTERFACE_VERSION",
+    "STEAMHTTP_INTERFACE_VERSION", "STEAMUNIFIEDMESSAGES_INTERFACE_VERSION", "STEAMCONTROLLER_INTERFACE_VERSION",
+    "SteamController", "STEAMUGC_INTERFACE_VERSION", "STEAMAPPLIST_INTERFACE_VERSION", "STEAMMUSIC_INTERFACE_VERSION",
+    "STEAMMUSICREMOTE_INTERFACE_VERSION", "STEAMHTMLSURFACE_INTERFACE_VERSION_", "STEAMINVENTORY_INTERFACE_V",
+    "STEAMVIDEO_INTERFACE_V", "SteamMasterServerUpdater", "SteamMatchGameSearch", "SteamParties", "SteamInput",
+    "STEAMREMOTEPLAY_INTERFACE_VERSION", "STEAMPARENTALSETTINGS_INTERFACE_VERSION", "STEAMAPPTICKET_INTERFACE_VERSION",
+    "SteamNetworkingMessages", "SteamNetworkingSockets", "SteamNetworkingUtils", "STEAMTIMELINE_INTERFACE_V",
+]
+INTERFACE_SET = set(INTERFACE_NAMES)
+# Candidate C strings: a Steam/STEAM name, optional version digits, then the NUL terminator
+# The literal prefix lets re skip ahead quickly, names are checked against INTERFACE_SET afterwards
+INTERFACE_RE = re.compile(rb'(?:Steam|STEAM)[A-Za-z_]+(\d*)(?=\x00)')
+IDENTIFIER_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_")
 
 def find_dir(base_dir, target_dir, extra_check=None):
     for root, dirs, _ in os.walk(base_dir):
@@ -29,15 +54,93 @@ def modify_overlay_config(src_path, dst_path, disable_overlay):
             else:
                 f.write(line)
 
-def generate_interfaces(dll_path):
+# Bundled generate_interfaces exe for the DLL's bitness, None if it's missing or can't run here
+def find_interface_tool(dll_path):
+    if os.name != 'nt':
+        return None
     tools_dir = find_dir(EMU_FOLDER, "tools", "generate_interfaces")
     dll_name = os.path.basename(dll_path).lower()
     generator_exe = f"generate_interfaces_{'x64' if dll_name == 'steam_api64.dll' else 'x32'}.exe"
+    if not tools_dir or not os.path.exists(os.path.join(tools_dir, generator_exe)):
+        return None
+    return os.path.join(tools_dir, generator_exe)
+
+def generate_interfaces(dll_path):
+    generator = find_interface_tool(dll_path)
+    if generator is None:
+        raise RuntimeError("generate_interfaces not found")
     
-    subprocess.run([os.path.join(tools_dir, generator_exe), dll_path], capture_output=True, text=True, cwd=os.path.dirname(dll_path), creationflags=subprocess.CREATE_NO_WINDOW)
+    subprocess.run([generator, dll_path], capture_output=True, text=True, cwd=os.path.dirname(dll_path),
+                   creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
     
     return os.path.join(os.path.dirname(dll_path), "steam_interfaces.txt")
 
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Scan the DLL for interface version strings without running the Windows-only tool
+def extract_interfaces(dll_path):
+    if os.path.getsize(dll_path) == 0:
+        return []
+    
+    found = {}    # name -> {interface: None}, keeps first-seen order without duplicates
+    with open(dll_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for match in INTERFACE_RE.finditer(data):
+            if match.start() > 0 and data[match.start() - 1] in IDENTIFIER_BYTES:
+                continue    # Tail of a longer string, e.g. ISteamUser023
+            
+            interface = match.group(0).decode()
+            name = interface[:match.start(1) - match.start()]
+            if name in INTERFACE_SET and (match.group(1) or name == "STEAMCONTROLLER_INTERFACE_VERSION"):
+                found.setdefault(name, {})[interface] = None
+    
+    # The bare controller string only counts when there is no versioned one
+    controller = found.get("STEAMCONTROLLER_INTERFACE_VERSION", {})
+    if len(controller) > 1:
+        controller.pop("STEAMCONTROLLER_INTERFACE_VERSION", None)
+    
+    return [interface for name in INTERFACE_NAMES for interface in found.get(name, ())]
+
+# The interfaces depend only on the DLL's bytes and most games ship one of a few builds,
+# so they are worked out once per build and later games copy them from the cache
+# The bundled tool is the reference where it can run, the scan covers everywhere else
+def write_interfaces(dll_path, dst_path):
+    digest = file_sha256(dll_path)
+    tool_cache = os.path.join(INTERFACE_CACHE_DIR, f"{digest}.tool.txt")
+    scan_cache = os.path.join(INTERFACE_CACHE_DIR, f"{digest}.scan{SCANNER_VERSION}.txt")
+    use_tool = find_interface_tool(dll_path) is not None
+    
+    # The tool's output is good for any run, a scan result only until the scanner changes
+    cache_path = tool_cache if use_tool or os.path.exists(tool_cache) else scan_cache
+    if not os.path.exists(cache_path):
+        os.makedirs(INTERFACE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        interfaces = extract_interfaces(dll_path)
+        
+        if use_tool:
+            generated = generate_interfaces(dll_path)
+            if not os.path.exists(generated) or os.path.getsize(generated) == 0:
+                raise RuntimeError("Interface generator produced no steam_interfaces.txt")
+            with open(generated, 'r', encoding='utf-8') as f:
+                expected = [line.strip() for line in f if line.strip()]
+            if interfaces != expected:
+                print(f"Interface scan differs from generate_interfaces: missing {sorted(set(expected) - set(interfaces))}, "
+                      f"extra {sorted(set(interfaces) - set(expected))}")
+            shutil.move(generated, tmp_path)
+        elif interfaces:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(interfaces) + "\n")
+        else:
+            raise RuntimeError("No Steam interfaces found in the DLL and generate_interfaces isn't available")
+        
+        os.replace(tmp_path, cache_path)
+    
+    shutil.copy2(cache_path, dst_path)
+
 def generate_emu(game_dir, app_id, dll_path, disable_overlay=False):
     try:
         if not dll_path or not os.path.exists(dll_path):
@@ -64,8 +167,8 @@ def generate_emu(game_dir, app_id, dll_path, disable_overlay=False):
         with open(os.path.join(settings_dir, "steam_appid.txt"), "w") as f:
             f.write(str(app_id))
 
-        # Generate and move interfaces file
-        shutil.move(generate_interfaces(dll_path), os.path.join(settings_dir, "steam_interfaces.txt"))
+        # Generate (or reuse) the interfaces file
+        write_interfaces(dll_path, os.path.join(settings_dir, "steam_interfaces.txt"))
 
         # Copy fonts and sounds
         src_settings = os.path.join("assets", "steam_settings")
@@ -0,0 +1,123 @@
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+POLL_INTERVAL = 0.05    # Seconds between checks while all slots are busy
+DECREASE_WINDOW = 1.0    # At most one multiplicative decrease per window
+
+# rate: requests/sec, burst: token bucket size, concurrency: max in-flight requests
+HOST_LIMITS = {
+    "store.steampowered.com": {"rate": 10.0, "burst": 10, "concurrency": 10},
+    "api.steampowered.com": {"rate": 10.0, "burst": 10, "concurrency": 4},
+    "steamcommunity.com": {"rate": 5.0, "burst": 5, "concurrency": 4},
+    "steamdb.info": {"rate": 2.0, "burst": 2, "concurrency": 2},
+    "cdn.fastly.steamstatic.com": {"rate": 100.0, "burst": 32, "concurrency": 16},
+}
+DEFAULT_LIMITS = {"rate": 10.0, "burst": 10, "concurrency": 8}
+
+# Token bucket with an AIMD concurrency window
+# Successes grow rate and concurrency additively, 429/5xx/errors halve them, slow responses shrink them slightly
+class HostLimiter:
+
+    __slots__ = ('host', 'max_rate', 'burst', 'max_concurrency', 'rate', 'concurrency',
+                 '_tokens', '_updated', '_in_flight', '_blocked_until', '_next_decrease',
+                 '_latency', '_base_latency', '_lock')
+
+    def __init__(self, host, rate, burst, concurrency):
+        self.host = host
+        self.max_rate = rate
+        self.burst = burst
+        self.max_concurrency = concurrency
+        self.rate = rate
+        self.concurrency = float(concurrency)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._next_decrease = 0.0
+        self._latency = None
+        self._base_latency = None
+        self._lock = threading.Lock()
+
+    # Take a slot and a token if both are free, otherwise return how long to wait
+    def try_acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._in_flight >= int(self.concurrency):
+                return POLL_INTERVAL
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+
+            self._tokens -= 1
+            self._in_flight += 1
+            return 0.0
+
+    def acquire(self):
+        while (delay := self.try_acquire()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        while (delay := self.try_acquire()) > 0:
+            await asyncio.sleep(delay)
+
+    # Report how the request went; status=None means it failed without a response
+    def release(self, status=None, latency=None, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if status is None or status == 429 or status >= 500:
+                if now >= self._next_decrease:
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    self.rate = max(0.5, self.rate / 2)
+                    self._next_decrease = now + DECREASE_WINDOW
+                if status == 429:
+                    cooldown = float(retry_after) if retry_after and str(retry_after).isdigit() else DECREASE_WINDOW
+                    self._blocked_until = max(self._blocked_until, now + cooldown)
+                return
+
+            if latency is not None:
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                self._base_latency = self._latency if self._base_latency is None else min(self._base_latency, self._latency)
+
+                # Queueing on the remote side shows up as latency before it shows up as 429s
+                if self._latency > 2 * self._base_latency + 0.05:
+                    self.concurrency = max(1.0, self.concurrency - 1 / self.concurrency)
+                    return
+
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + 1 / self.concurrency)
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# Shared limiter for the host of a URL
+def get_limiter(url):
+    host = urlparse(url).hostname or ""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter(host, **HOST_LIMITS.get(host, DEFAULT_LIMITS))
+        return _limiters[host]
+
+# GET through the host's limiter; 429/503 answers are retried after the limiter backs off
+def limited_get(session, url, retries=0, **kwargs):
+    limiter = get_limiter(url)
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        started = time.monotonic()
+        status = retry_after = None
+        try:
+            response = session.get(url, **kwargs)
+            status = response.status_code
+            retry_after = response.headers.get('Retry-After')
+        finally:
+            limiter.release(status, time.monotonic() - started, retry_after)
+
+        if status not in (429, 503) or attempt == retries:
+            return response
@@ -3,9 +3,11 @@ import subprocess
 from curl_cffi import requests
 
 # Supress subprocess window
-startupinfo = subprocess.STARTUPINFO()
-startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-startupinfo.wShowWindow = subprocess.SW_HIDE
+startupinfo = None
+if os.name == 'nt':    # STARTUPINFO only exists on Windows, the module still imports elsewhere
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
 
 SEVENZIP_PATH = os.path.join("assets", "7zip", "7za.exe")
 GOLDBERG_URL = "https://github.com/0xNullPointers/gbe_fork/releases/latest/download/emu-win-release.7z"
@@ -372,7 +372,12 @@ Click Generate to start the process."""
 
     # Process input
     def process_input(self, app_id, game_name):
-        from src.core.appID_finder import get_steam_app_by_id, get_steam_app_by_name    # import
+        from src.core.appID_finder import get_app_index, get_steam_app_by_id, get_steam_app_by_name    # import
+
+        get_app_index().configure(
+            api_key=self.config.get('Settings', 'steam_api_key', fallback='').strip(),
+            max_age=self.config.getfloat('Settings', 'app_list_max_age', fallback=24) * 60 * 60
+        )
 
         result = {}
         
@@ -488,35 +493,41 @@ Click Generate to start the process."""
             raise Exception("Failed to generate Goldberg emu files")
         
         self.write_output("Fetching DLCs...")
-        dlc_details = fetch_dlc(app_id)
+        dlc_details = fetch_dlc(app_id, max_age=self.config.getfloat('Settings', 'dlc_cache_hours', fallback=24) * 60 * 60)
         create_dlc_config(game_dir, dlc_details)
         return dll_path
                 
     # Fetch and generate achievements.json
     def _generate_achievements(self, settings_dir, app_id, use_steam):
         self.write_output("Fetching Achievements...")
-        original_cwd = os.getcwd()
+        achievements = self._fetch_achievements(app_id, use_steam, settings_dir)
+        if not achievements:
+            self.write_output("No achievements found.")
+
+    def _fetch_achievements(self, app_id, use_steam, output_dir):
+        from src.core.achievements import fetch_achievements, fetch_from_steamapi, fetch_from_steamcommunity    # import
         
-        try:
-            os.chdir(settings_dir)
-            achievements = self._fetch_achievements(app_id, use_steam)
-            if not achievements:
-                self.write_output("No achievements found.")
-        finally:
-            os.chdir(original_cwd)
-
-    def _fetch_achievements(self, app_id, use_steam):
-        from src.core.achievements import fetch_from_steamcommunity, fetch_from_steamdb    # import
+        cache_ttl = self.config.getfloat('Settings', 'achievement_cache_hours', fallback=168) * 60 * 60
+        
+        # Web API schema is one JSON request, use it whenever a key is configured
+        api_key = self.config.get('Settings', 'steam_api_key', fallback='').strip()
+        if api_key:
+            try:
+                achievements = fetch_from_steamapi(app_id, api_key, silent=True, cache_ttl=cache_ttl, output_dir=output_dir)
+                if achievements:
+                    return achievements
+            except Exception:
+                pass
         
         if use_steam:
             try:
-                return fetch_from_steamcommunity(app_id, silent=True)
+                return fetch_from_steamcommunity(app_id, silent=True, cache_ttl=cache_ttl, output_dir=output_dir)
             except Exception:
                 return None
         
+        # SteamDB has the real API names but needs a browser, so Steam Community races it as a fallback
         try:
-            achievements = fetch_from_steamdb(app_id, silent=True) or fetch_from_steamcommunity(app_id, silent=True)
-            return achievements
+            return fetch_achievements(app_id, prefer="steamdb", silent=True, cache_ttl=cache_ttl, output_dir=output_dir)
         except Exception:
             return None
 
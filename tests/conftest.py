@@ -0,0 +1,43 @@
+import time
+import threading
+import http.server
+import pytest
+
+# Local stand-in for a Steam host
+# routes: path -> list of (status, headers, body) served in turn, the last one repeats
+class StandInServer:
+    def __init__(self):
+        self.routes = {}
+        self.requests = []    # Raw request paths, query string included
+        self.delays = {}    # path -> seconds to wait before answering, like a slow CDN
+        
+        server = self
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                responses = server.routes.get(self.path.split('?')[0], [(404, {}, b"")])
+                status, headers, body = responses.pop(0) if len(responses) > 1 else responses[0]
+                time.sleep(server.delays.get(self.path.split('?')[0], 0))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def hits(self, path):
+        return sum(1 for p in self.requests if p.split('?')[0] == path)
+
+@pytest.fixture
+def stand_in():
+    server = StandInServer()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import pytest
+from src.core import achievements, rate_limiter
+from src.core.achievements import create_session, download_images, save_achievements
+
+ICON = b"\x89PNG fake icon"
+
+@pytest.fixture
+def cdn(stand_in, tmp_path, monkeypatch):
+    monkeypatch.setattr(achievements, "IMAGE_CDN_URL", stand_in.url + "/{appid}/{name}")
+    monkeypatch.setattr(achievements, "IMAGE_CACHE_DIR", str(tmp_path / "image_cache"))
+    monkeypatch.setattr(achievements, "RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(rate_limiter, "_limiters", {})    # Backoff from another test's 429/503 would slow this one
+    return stand_in
+
+def entries(*names):
+    return [{"name": name, "icon": f"images/{name}.jpg", "icongray": f"images/{name}.jpg"} for name in names]
+
+def download(tmp_path, names, use_async=True):
+    session = create_session("steam")
+    try:
+        return download_images("10", entries(*names), session, silent=True, use_async=use_async, output_dir=str(tmp_path / "out"))
+    finally:
+        session.close()
+
+def test_async_download_retries(cdn, tmp_path):
+    cdn.routes["/10/flaky.jpg"] = [(503, {}, b""), (503, {}, b""), (200, {}, ICON)]
+    cdn.routes["/10/limited.jpg"] = [(429, {"Retry-After": "1"}, b""), (200, {}, ICON)]
+    cdn.routes["/10/gone.jpg"] = [(404, {}, b"")]
+    
+    started = time.monotonic()
+    failures = download(tmp_path, ["flaky", "limited", "gone"])
+    
+    images = tmp_path / "out" / "images"
+    assert (images / "flaky.jpg").read_bytes() == ICON
+    assert (images / "limited.jpg").read_bytes() == ICON
+    assert time.monotonic() - started >= 1    # Retry-After was honoured
+    assert cdn.hits("/10/flaky.jpg") == 3
+    
+    # 404 is final, reported and not retried
+    assert failures == {"gone.jpg": "HTTP 404"}
+    assert cdn.hits("/10/gone.jpg") == 1
+    assert not (images / "gone.jpg").exists()
+    assert not [f for f in os.listdir(achievements.IMAGE_CACHE_DIR) if f.endswith(".tmp")]
+
+def test_async_download_gives_up(cdn, tmp_path):
+    cdn.routes["/10/down.jpg"] = [(503, {}, b"")]
+    
+    assert download(tmp_path, ["down"]) == {"down.jpg": "HTTP 503"}
+    assert cdn.hits("/10/down.jpg") == achievements.IMAGE_RETRIES + 1
+    assert not [f for f in os.listdir(achievements.IMAGE_CACHE_DIR) if f.endswith(".tmp")]
+
+def test_threaded_download_reports_failures(cdn, tmp_path):
+    cdn.routes["/10/ok.jpg"] = [(200, {}, ICON)]
+    cdn.routes["/10/gone.jpg"] = [(404, {}, b"")]
+    
+    assert download(tmp_path, ["ok", "gone"], use_async=False) == {"gone.jpg": "download failed"}
+    assert (tmp_path / "out" / "images" / "ok.jpg").read_bytes() == ICON
+
+@pytest.mark.parametrize("use_async", [True, False])
+def test_downloads_run_concurrently(cdn, tmp_path, use_async):
+    names = [f"slow{i}" for i in range(16)]
+    for name in names:
+        cdn.routes[f"/10/{name}.jpg"] = [(200, {}, ICON)]
+        cdn.delays[f"/10/{name}.jpg"] = 0.3
+    
+    started = time.monotonic()
+    assert download(tmp_path, names, use_async=use_async) == {}
+    # One at a time this would take 16 * 0.3s
+    assert time.monotonic() - started < 16 * 0.3 / 3
+    assert len(os.listdir(tmp_path / "out" / "images")) == 16
+
+def test_save_achievements_returns_failures(cdn, tmp_path):
+    cdn.routes["/10/ok.jpg"] = [(200, {}, ICON)]
+    cdn.routes["/10/gone.jpg"] = [(404, {}, b"")]
+    
+    session = create_session("steam")
+    try:
+        failures = save_achievements("10", entries("ok", "gone"), session, silent=True, output_dir=str(tmp_path))
+    finally:
+        session.close()
+    
+    assert failures == {"gone.jpg": "HTTP 404"}
+    assert (tmp_path / "achievements.json").exists()
+
+API_KEY = "0123456789ABCDEF0123456789ABCDEF"
+SCHEMA = {"game": {"availableGameStats": {"achievements": [
+    {"name": "ACH_WIN", "displayName": "Winner", "description": "Win a game", "hidden": 0,
+     "icon": "https://cdn.example/10/win.jpg", "icongray": "https://cdn.example/10/win_gray.jpg"},
+]}}}
+
+@pytest.fixture
+def steam_api(cdn, monkeypatch):
+    monkeypatch.setattr(achievements, "STEAM_API_URL", cdn.url)
+    monkeypatch.setattr(achievements, "store_cached_achievements", lambda *args: None)
+    return cdn
+
+def test_steamapi_sends_key_as_params(steam_api, tmp_path):
+    steam_api.routes["/ISteamUserStats/GetSchemaForGame/v2/"] = [(200, {"Content-Type": "application/json"}, json.dumps(SCHEMA).encode())]
+    steam_api.routes["/10/win.jpg"] = steam_api.routes["/10/win_gray.jpg"] = [(200, {}, ICON)]
+    
+    result = achievements.fetch_from_steamapi("10", API_KEY, silent=True, cache_ttl=0, output_dir=str(tmp_path))
+    
+    assert [a["name"] for a in result] == ["ACH_WIN"]
+    assert result[0]["icongray"] == "images/win_gray.jpg"
+    request = next(p for p in steam_api.requests if p.startswith("/ISteamUserStats/"))
+    assert f"key={API_KEY}" in request and "appid=10" in request and "l=english" in request
+
+def test_steamapi_errors_leave_out_key(steam_api, tmp_path):
+    steam_api.routes["/ISteamUserStats/GetSchemaForGame/v2/"] = [(403, {}, b"Forbidden")]
+    with pytest.raises(RuntimeError) as error:
+        achievements.fetch_from_steamapi("10", API_KEY, silent=True, cache_ttl=0, output_dir=str(tmp_path))
+    assert API_KEY not in str(error.value)
+    
+    # Nothing listening: the connection error names the URL
+    steam_api.httpd.shutdown()
+    steam_api.httpd.server_close()
+    with pytest.raises(RuntimeError) as error:
+        achievements.fetch_from_steamapi("10", API_KEY, silent=True, cache_ttl=0, output_dir=str(tmp_path))
+    assert "GetSchemaForGame" in str(error.value) and API_KEY not in str(error.value)
@@ -0,0 +1,58 @@
+import sqlite3
+import pytest
+from src.core import appID_finder
+from src.core.appID_finder import AppIndex, ingest_app_list
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "apps.db"))
+    conn.execute('''CREATE TABLE apps (appid INTEGER PRIMARY KEY, name TEXT)''')
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    names = ["Half-Life 2", "Cyberpunk 2077", "Cyberpunk 2077: Phantom Liberty", "Unko", "The Ring Quest", "Stormbringer"]
+    names += [f"Filler Game {i}" for i in range(300)]
+    monkeypatch.setattr(appID_finder, 'stream_app_list', lambda: ({'appid': i + 1, 'name': name} for i, name in enumerate(names)))
+    index = AppIndex(str(tmp_path)).configure(max_age=None).ensure_ready()
+    if not index.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    yield index
+    index.conn.close()
+
+def names(results):
+    return [result['name'] for result in results]
+
+def pragmas(conn):
+    return {pragma: conn.execute(f'PRAGMA {pragma}').fetchone()[0] for pragma in ('synchronous', 'temp_store', 'cache_size')}
+
+def test_ingest_restores_pragmas(conn):
+    conn.execute('PRAGMA synchronous = FULL')
+    conn.execute('PRAGMA cache_size = -4000')
+    before = pragmas(conn)
+    
+    assert ingest_app_list(conn, ({'appid': i, 'name': f"App {i}"} for i in range(2500)), batch_size=1000) == 2500
+    assert pragmas(conn) == before
+    assert conn.execute('SELECT COUNT(*) FROM apps').fetchone()[0] == 2500
+
+def test_ingest_restores_pragmas_on_error(conn):
+    before = pragmas(conn)
+    with pytest.raises(KeyError):
+        ingest_app_list(conn, [{'appid': 1, 'name': "App"}, {'appid': 2}])
+    assert pragmas(conn) == before
+    assert conn.execute('SELECT COUNT(*) FROM apps').fetchone()[0] == 0
+
+def test_fuzzy_search_finds_typos(index):
+    assert names(index.search("Cyberpnk", 5)) == ["Cyberpunk 2077", "Cyberpunk 2077: Phantom Liberty"]
+    assert names(index.search("Thering Quest", 5))[0] == "The Ring Quest"
+
+def test_fuzzy_search_needs_trigram_overlap(index):
+    assert index.search("xyzzy nothing here", 5) == []
+    # A single shared trigram ("unk") is not enough to be a candidate
+    assert "Unko" not in names(index.search("Cyberpunk 2077", 5))
+
+def test_normalized_name_lookup(index):
+    assert index.find_by_normalized_name("Half Life 2") == {'appid': 1, 'name': "Half-Life 2"}
+    assert index.find_by_normalized_name("half-life: 2") == {'appid': 1, 'name': "Half-Life 2"}
+    assert index.find_by_normalized_name("Half Life") is None
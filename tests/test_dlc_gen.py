@@ -0,0 +1,66 @@
+import pytest
+from src.core import dlc_gen
+from src.core.appID_finder import AppIndex
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+    
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+class FakeSession:
+    def __init__(self, data):
+        self.data = data
+    
+    def get(self, url, **kwargs):
+        if isinstance(self.data, Exception):
+            raise self.data
+        return FakeResponse(self.data)
+
+@pytest.mark.parametrize("data, expected", [
+    ({"10": {"success": True, "data": {"dlc": [11, 12]}}}, [11, 12]),
+    ({"10": {"success": True, "data": {}}}, []),    # Answered, no DLCs
+    ({"10": {"success": False}}, None),
+    (ConnectionError("offline"), None),
+])
+def test_fetch_steam_dlc_ids(data, expected):
+    assert dlc_gen.fetch_steam_dlc_ids(FakeSession(data), 10) == expected
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    index = AppIndex(str(tmp_path))
+    monkeypatch.setattr(dlc_gen, "get_app_index", lambda: index)
+    monkeypatch.setattr(dlc_gen, "_dlc_table_ready", False)
+    return index
+
+def fake_network(monkeypatch, result):
+    calls = []
+    def fetch(app_id):
+        calls.append(app_id)
+        return result
+    monkeypatch.setattr(dlc_gen, "fetch_dlc_from_network", fetch)
+    return calls
+
+def test_confirmed_empty_list_is_stored(catalogue, monkeypatch):
+    calls = fake_network(monkeypatch, ({}, True))
+    assert dlc_gen.fetch_dlc(10) == {}
+    assert dlc_gen.fetch_dlc(10) == {}
+    assert calls == [10]
+
+def test_failed_fetch_is_not_stored(catalogue, monkeypatch):
+    calls = fake_network(monkeypatch, ({}, False))
+    dlc_gen.fetch_dlc(10)
+    dlc_gen.fetch_dlc(10)
+    assert calls == [10, 10]
+
+def test_stored_dlcs_replace_empty_marker(catalogue, monkeypatch):
+    dlc_gen.store_cached_dlcs(10, {})
+    dlc_gen.store_cached_dlcs(10, {11: "Soundtrack"})
+    assert dlc_gen.load_cached_dlcs(10)[0] == {11: "Soundtrack"}
@@ -0,0 +1,134 @@
+import os
+import random
+import pytest
+from src.core import goldberg_gen
+from src.core.goldberg_gen import extract_interfaces, write_interfaces
+
+MODERN_INTERFACES = [
+    "SteamClient021", "SteamGameServer015", "SteamGameServerStats001", "SteamUser023", "SteamFriends017",
+    "SteamUtils010", "SteamMatchMaking009", "SteamMatchMakingServers002", "STEAMUSERSTATS_INTERFACE_VERSION012",
+    "STEAMAPPS_INTERFACE_VERSION008", "SteamNetworking006", "STEAMREMOTESTORAGE_INTERFACE_VERSION016",
+    "STEAMSCREENSHOTS_INTERFACE_VERSION003", "STEAMHTTP_INTERFACE_VERSION003", "STEAMUGC_INTERFACE_VERSION017",
+    "STEAMHTMLSURFACE_INTERFACE_VERSION_005", "STEAMINVENTORY_INTERFACE_V003", "STEAMVIDEO_INTERFACE_V007",
+    "SteamController008", "SteamInput006", "SteamParties002", "STEAMREMOTEPLAY_INTERFACE_VERSION002",
+    "STEAMPARENTALSETTINGS_INTERFACE_VERSION001", "SteamNetworkingSockets012", "SteamNetworkingUtils004",
+    "SteamNetworkingMessages002", "SteamMatchGameSearch001", "STEAMAPPTICKET_INTERFACE_VERSION001",
+    "STEAMTIMELINE_INTERFACE_V004", "SteamClient020",
+]
+
+# Strings that look like interfaces but aren't: a longer symbol, a suffix, an unknown name
+DECOYS = ["ISteamUser023", "SteamUser023x", "SteamUserStats012", "SteamNetworkingSocketsSerialized003"]
+
+# Random bytes with each string dropped in NUL-terminated, the way a DLL's .rdata holds them
+def make_dll(path, strings, filler=4096, seed=1):
+    rng = random.Random(seed)
+    with open(path, 'wb') as f:
+        for s in strings:
+            f.write(rng.randbytes(filler))
+            f.write(b"\x00" + s.encode() + b"\x00")
+        f.write(rng.randbytes(filler))
+    return str(path)
+
+# Order the tool writes them in: by INTERFACE_NAMES, then by first appearance
+def expected_order(interfaces):
+    return [i for name in goldberg_gen.INTERFACE_NAMES for i in interfaces if i.rstrip("0123456789") == name]
+
+@pytest.fixture
+def interface_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "interface_cache"
+    monkeypatch.setattr(goldberg_gen, "INTERFACE_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+def test_modern_dll(tmp_path):
+    dll = make_dll(tmp_path / "steam_api64.dll", MODERN_INTERFACES + DECOYS + ["SteamUser023"])
+    assert extract_interfaces(dll) == expected_order(MODERN_INTERFACES)
+
+def test_game_search_interface(tmp_path):
+    dll = make_dll(tmp_path / "steam_api64.dll", ["SteamClient021", "SteamMatchGameSearch001", "SteamUser023"])
+    assert extract_interfaces(dll) == ["SteamClient021", "SteamUser023", "SteamMatchGameSearch001"]
+
+def test_old_sdk_bare_controller(tmp_path):
+    dll = make_dll(tmp_path / "steam_api.dll", ["SteamClient008", "SteamUser012", "STEAMCONTROLLER_INTERFACE_VERSION",
+                                                "STEAMAPPS_INTERFACE_VERSION003"])
+    assert extract_interfaces(dll) == ["SteamClient008", "SteamUser012", "STEAMAPPS_INTERFACE_VERSION003",
+                                       "STEAMCONTROLLER_INTERFACE_VERSION"]
+
+def test_versioned_controller_wins_over_bare(tmp_path):
+    dll = make_dll(tmp_path / "steam_api.dll", ["STEAMCONTROLLER_INTERFACE_VERSION", "SteamController007",
+                                                "STEAMCONTROLLER_INTERFACE_VERSION001"])
+    assert extract_interfaces(dll) == ["STEAMCONTROLLER_INTERFACE_VERSION001", "SteamController007"]
+
+def test_empty_file(tmp_path):
+    dll = tmp_path / "steam_api.dll"
+    dll.write_bytes(b"")
+    assert extract_interfaces(str(dll)) == []
+
+# Stand-in for the bundled exe: writes steam_interfaces.txt next to the DLL like the real one
+def fake_tool(monkeypatch, output):
+    calls = []
+    def generate_interfaces(dll_path):
+        calls.append(dll_path)
+        generated = os.path.join(os.path.dirname(dll_path), "steam_interfaces.txt")
+        with open(generated, 'w') as f:
+            f.write(output)
+        return generated
+    monkeypatch.setattr(goldberg_gen, "find_interface_tool", lambda dll_path: "generate_interfaces_x64.exe")
+    monkeypatch.setattr(goldberg_gen, "generate_interfaces", generate_interfaces)
+    return calls
+
+def no_tool(monkeypatch):
+    monkeypatch.setattr(goldberg_gen, "find_interface_tool", lambda dll_path: None)
+
+def test_write_interfaces_uses_scan_and_cache(tmp_path, interface_cache, monkeypatch):
+    no_tool(monkeypatch)
+    dll = make_dll(tmp_path / "steam_api64.dll", MODERN_INTERFACES)
+    dst = tmp_path / "steam_interfaces.txt"
+    write_interfaces(dll, str(dst))
+    assert dst.read_text().splitlines() == expected_order(MODERN_INTERFACES)
+    assert os.listdir(interface_cache) == [f"{goldberg_gen.file_sha256(dll)}.scan{goldberg_gen.SCANNER_VERSION}.txt"]
+
+def test_scanner_version_invalidates_scan_results(tmp_path, interface_cache, monkeypatch):
+    no_tool(monkeypatch)
+    dll = make_dll(tmp_path / "steam_api64.dll", MODERN_INTERFACES)
+    dst = tmp_path / "steam_interfaces.txt"
+    write_interfaces(dll, str(dst))
+    
+    # An older scanner's result for the same DLL is not reused
+    cached = interface_cache / os.listdir(interface_cache)[0]
+    cached.write_text("SteamClient021\n")
+    monkeypatch.setattr(goldberg_gen, "SCANNER_VERSION", goldberg_gen.SCANNER_VERSION + 1)
+    write_interfaces(dll, str(dst))
+    assert dst.read_text().splitlines() == expected_order(MODERN_INTERFACES)
+
+def test_tool_result_serves_later_runs_without_tool(tmp_path, interface_cache, monkeypatch):
+    fake_tool(monkeypatch, "SteamClient021\nSteamMatchGameSearch001\n")
+    dll = make_dll(tmp_path / "steam_api64.dll", ["SteamClient021"])
+    write_interfaces(dll, str(tmp_path / "a.txt"))
+    
+    no_tool(monkeypatch)
+    write_interfaces(dll, str(tmp_path / "b.txt"))
+    assert (tmp_path / "b.txt").read_text() == "SteamClient021\nSteamMatchGameSearch001\n"
+
+def test_write_interfaces_prefers_tool(tmp_path, interface_cache, monkeypatch, capsys):
+    calls = fake_tool(monkeypatch, "SteamClient021\nSteamUser023\nSteamMatchGameSearch001\n")
+    dll = make_dll(tmp_path / "steam_api64.dll", ["SteamClient021", "SteamUser023"])
+    dst = tmp_path / "out.txt"
+    write_interfaces(dll, str(dst))
+    write_interfaces(dll, str(dst))    # Second run is served from the cache
+    
+    assert calls == [dll]
+    assert dst.read_text() == "SteamClient021\nSteamUser023\nSteamMatchGameSearch001\n"
+    assert "missing ['SteamMatchGameSearch001']" in capsys.readouterr().out    # Scan checked against the tool
+
+def test_write_interfaces_agrees_with_tool(tmp_path, interface_cache, monkeypatch, capsys):
+    fake_tool(monkeypatch, "\n".join(expected_order(MODERN_INTERFACES)) + "\n")
+    dll = make_dll(tmp_path / "steam_api64.dll", MODERN_INTERFACES + DECOYS)
+    write_interfaces(dll, str(tmp_path / "out.txt"))
+    assert capsys.readouterr().out == ""
+
+def test_write_interfaces_without_tool_or_interfaces(tmp_path, interface_cache, monkeypatch):
+    no_tool(monkeypatch)
+    dll = make_dll(tmp_path / "steam_api.dll", [])
+    with pytest.raises(RuntimeError):
+        write_interfaces(dll, str(tmp_path / "out.txt"))
+    assert not os.listdir(interface_cache)